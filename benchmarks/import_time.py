@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Track the import-time budget of the greeter's startup modules.
+
+Each module is imported in a fresh interpreter with -X importtime. The
+cumulative import time of the module and the slowest imports it pulls in are
+reported. The run fails if the total exceeds --budget milliseconds, or if a
+typelib that must only load when its page is reached (Gst, Cvc, Xfconf, dbus)
+is imported at startup.
+
+usage: python3 benchmarks/import_time.py [--budget 400] [--top 10] [module ...]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# Loaded on demand by the pages that need them
+lazy_modules = ["gi.repository.Gst", "gi.repository.Cvc", "gi.repository.Xfconf", "dbus"]
+
+
+def import_times(module):
+    """Returns [(name, self_us, cumulative_us)] of module and the imports it
+    triggered, leaving out what the interpreter imported at startup."""
+    env = dict(os.environ, PYTHONPATH=src_dir)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import {}".format(module)],
+                            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+    times = []
+    for line in result.stderr.decode("utf-8").splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times.append((name.rstrip(), int(self_us), int(cumulative_us)))
+
+    # Nested imports are indented and listed before the module that imported them
+    end = next(i for i, (name, _, _) in enumerate(times) if name.strip() == module and name[1] != " ")
+    start = end
+    while start > 0 and times[start - 1][0][1] == " ":
+        start -= 1
+    return [(name.strip(), self_us, cumulative_us) for name, self_us, cumulative_us in times[start:end + 1]]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=float, default=400, help="milliseconds per module")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("modules", nargs="*", default=["MainWindow"])
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        times = import_times(module)
+        total_ms = next(cumulative for name, _, cumulative in times if name == module) / 1000
+        status = "ok" if total_ms <= args.budget else "OVER BUDGET"
+        print("{}: {:.1f} ms (budget {:.0f} ms) {}".format(module, total_ms, args.budget, status))
+        failed = failed or total_ms > args.budget
+
+        for name, self_us, cumulative_us in sorted(times, key=lambda t: t[1], reverse=True)[:args.top]:
+            print("  {:>8.1f} ms self {:>8.1f} ms cumulative  {}".format(self_us / 1000, cumulative_us / 1000, name))
+
+        eager = [name for name, _, _ in times if name in lazy_modules]
+        for name in eager:
+            print("  {} is imported at startup, it should load with its page".format(name))
+        failed = failed or bool(eager)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
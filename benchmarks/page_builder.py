@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Compare GtkBuilder startup cost of building every wizard page up front with
+building only the welcome page, as MainWindow does now.
+
+"all-pages" parses MainWindow.glade and all ui/pages/*.ui files, which is the
+same object tree the single glade file used to hold. "welcome" parses
+MainWindow.glade and pages/welcome.ui only. Each mode runs in its own process
+and reports the median parse time, the number of widgets in the window and
+the peak RSS (ru_maxrss).
+
+The compiled bundle is used if it was built with setup.py, otherwise the ui
+files are read from ui/. A display is needed, e.g. run it with xvfb-run.
+
+usage: python3 benchmarks/page_builder.py [runs]
+"""
+
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+pages = ["welcome", "display", "sound", "theme", "wallpaper", "nightlight", "applications", "support"]
+
+
+class Handlers(object):
+    # Accepts every signal handler named in the ui files
+    def __getattr__(self, name):
+        return lambda *args: None
+
+
+def count_widgets(widget):
+    count = 1
+    if hasattr(widget, "forall"):
+        # forall also visits internal children, e.g. the buttons' labels
+        children = []
+        widget.forall(children.append)
+        for child in children:
+            count += count_widgets(child)
+    return count
+
+
+def build(page_names):
+    from Resources import new_builder
+
+    builder = new_builder("MainWindow.glade", Handlers(), "eta-cinnamon-greeter")
+    for name in page_names:
+        page = builder.get_object("page_{}".format(name))
+        page_builder = new_builder("pages/{}.ui".format(name), Handlers(), "eta-cinnamon-greeter")
+        page.pack_start(page_builder.get_object("page_{}_content".format(name)), True, True, 0)
+    return builder.get_object("window")
+
+
+def run_mode(mode, runs):
+    import gi
+
+    gi.require_version("Gtk", "3.0")
+    from gi.repository import Gtk
+
+    page_names = pages if mode == "all-pages" else pages[:1]
+
+    times = []
+    widgets = 0
+    for i in range(runs):
+        start = time.perf_counter()
+        window = build(page_names)
+        times.append(time.perf_counter() - start)
+        widgets = count_widgets(window)
+        window.destroy()
+        while Gtk.events_pending():
+            Gtk.main_iteration()
+
+    # ru_maxrss is in kilobytes on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print("{:.4f} {} {}".format(statistics.median(times), widgets, peak_rss))
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--mode":
+        run_mode(sys.argv[2], int(sys.argv[3]))
+        return
+
+    runs = sys.argv[1] if len(sys.argv) > 1 else "20"
+    print("{:<10} {:>10} {:>8} {:>14}".format("mode", "parse (ms)", "widgets", "peak RSS (MB)"))
+    for mode in ("all-pages", "welcome"):
+        output = subprocess.check_output([sys.executable, os.path.abspath(__file__), "--mode", mode, runs])
+        elapsed, widgets, peak_rss = output.decode("utf-8").split()
+        print("{:<10} {:>10.2f} {:>8} {:>14.1f}".format(mode, float(elapsed) * 1000, widgets, int(peak_rss) / 1024))
+
+
+if __name__ == "__main__":
+    main()
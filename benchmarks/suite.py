@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark suite for the greeter's data paths.
+
+Cases:
+  wallpapers     WallpaperManager.get_wallpapers and WallpaperLoader
+                 thumbnailing over a synthetic image tree, cold and warm cache
+  network        Server and Stream against a local HTTP stand-in with
+                 --latency ms per request, cold and warm cache
+  theme          ThemeManager get/set against the memory GSettings backend
+  user_settings  UserSettings read/write
+
+Every case runs in its own process with HOME and the XDG directories pointed
+at a temporary directory, so the user's files, caches and settings are never
+touched and the peak RSS (ru_maxrss) belongs to that case alone. No display
+is needed.
+
+Results are compared with the stored baselines (benchmarks/baselines.json).
+Each case runs --repeat times and the median of every metric is reported.
+A time above the baseline by more than --time-tolerance, or a peak RSS above
+it by more than --rss-tolerance, is a regression and makes the run exit with
+status 1, as does a case that fails to run; the other cases still run. A
+metric without a baseline is only a warning. Baselines depend on
+the machine: record all cases on the CI box with --save and commit the file.
+
+usage: python3 benchmarks/suite.py [--cases wallpapers,network] [--save]
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(benchmarks_dir, "..", "src")
+sys.path.insert(0, src_dir)
+
+cases = ["wallpapers", "network", "theme", "user_settings"]
+
+
+def run_loop(loop, timeout=120):
+    from gi.repository import GLib
+
+    timed_out = []
+
+    def on_timeout():
+        timed_out.append(True)
+        loop.quit()
+        return False
+
+    source = GLib.timeout_add_seconds(timeout, on_timeout)
+    loop.run()
+    if timed_out:
+        raise RuntimeError("timed out after {} s".format(timeout))
+    GLib.source_remove(source)
+
+
+# - wallpapers
+def create_image_tree(directory, count):
+    import random
+
+    import gi
+
+    gi.require_version("GdkPixbuf", "2.0")
+    from gi.repository import GdkPixbuf, GLib
+
+    # Smooth random gradients, a flat colour would make decoding unrealistically cheap
+    rng = random.Random(count)
+    os.makedirs(directory, exist_ok=True)
+    for i in range(count):
+        noise = GdkPixbuf.Pixbuf.new_from_bytes(GLib.Bytes.new(bytes(rng.getrandbits(8) for _ in range(32 * 18 * 3))),
+                                                GdkPixbuf.Colorspace.RGB, False, 8, 32, 18, 32 * 3)
+        image = noise.scale_simple(1920, 1080, GdkPixbuf.InterpType.BILINEAR)
+        if i % 4:
+            image.savev(os.path.join(directory, "wallpaper-{:03}.jpg".format(i)), "jpeg", ["quality"], ["90"])
+        else:
+            image.savev(os.path.join(directory, "wallpaper-{:03}.png".format(i)), "png", [], [])
+
+    # Files the wallpaper index has to skip
+    for name in ["pardus.xml", "LICENSE"]:
+        with open(os.path.join(directory, name), "w") as f:
+            f.write("not an image\n")
+    os.makedirs(os.path.join(directory, "contest"), exist_ok=True)
+
+
+def case_wallpapers(args, workdir):
+    import WallpaperManager
+    from ThumbnailCache import ThumbnailCache
+    from WallpaperLoader import WallpaperLoader
+    from gi.repository import GLib
+
+    WallpaperManager.wallpaper_dir = os.path.join(workdir, "backgrounds")
+    create_image_tree(WallpaperManager.wallpaper_dir, args.images)
+
+    def thumbnails(paths):
+        loop = GLib.MainLoop()
+        loaded = []
+        loader = WallpaperLoader(ThumbnailCache(240, 135))
+        start = time.perf_counter()
+        loader.start(paths, lambda path, pixbuf: loaded.append(path), lambda paths: loop.quit())
+        run_loop(loop)
+        elapsed = time.perf_counter() - start
+        if len(loaded) != len(paths):
+            raise RuntimeError("{} of {} thumbnails loaded".format(len(loaded), len(paths)))
+        return elapsed
+
+    results = {}
+    start = time.perf_counter()
+    paths = WallpaperManager.get_wallpapers()
+    results["index_cold_s"] = time.perf_counter() - start
+    if len(paths) != args.images:
+        raise RuntimeError("{} of {} wallpapers listed".format(len(paths), args.images))
+
+    start = time.perf_counter()
+    WallpaperManager.get_wallpapers()
+    results["index_warm_s"] = time.perf_counter() - start
+
+    results["thumbnails_cold_s"] = thumbnails(paths)
+    results["thumbnails_warm_s"] = thumbnails(paths)
+    return results
+
+
+# - network
+class StandIn(object):
+    """Local stand-in for the greeter API and its icon host."""
+
+    def __init__(self, suggestions, latency):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        import gi
+
+        gi.require_version("GdkPixbuf", "2.0")
+        from gi.repository import GdkPixbuf
+
+        icon = GdkPixbuf.Pixbuf.new(GdkPixbuf.Colorspace.RGB, True, 8, 128, 128)
+        icon.fill(0x3584e4ff)
+        success, icon_png = icon.save_to_bufferv("png", [], [])
+
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(latency / 1000)
+                if self.path == "/api/greeter":
+                    if self.headers.get("If-None-Match") == stand_in.etag:
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+                    self.reply(stand_in.feed, "application/json", {"ETag": stand_in.etag})
+                elif self.path.startswith("/icons/"):
+                    self.reply(icon_png, "image/png")
+                else:
+                    self.send_error(404)
+
+            def reply(self, contents, content_type, headers={}):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(contents)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(contents)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:{}".format(self.server.server_address[1])
+        self.etag = '"{}"'.format(suggestions)
+        self.feed = json.dumps({"greeter": {"suggestions": [
+            {"name": "app-{}".format(i), "icon": "{}/icons/{}.png".format(self.url, i),
+             "pretty_en": "Application {}".format(i), "pretty_tr": "Uygulama {}".format(i)}
+            for i in range(suggestions)]}}).encode("utf-8")
+
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+
+
+def case_network(args, workdir):
+    from Request import Request
+    from Server import Server
+    from Stream import Stream
+    from Suggestion import parse_suggestions
+    from gi.repository import GLib
+
+    stand_in = StandIn(args.suggestions, args.latency)
+
+    def fetch():
+        loop = GLib.MainLoop()
+        state = {"responded": False, "icons": 0}
+
+        def done():
+            if state["responded"] and state["icons"] == args.suggestions:
+                loop.quit()
+
+        def on_server_get(response):
+            if "error" in response:
+                raise RuntimeError(response["message"])
+            for suggestion in parse_suggestions(response):
+                stream.fetch(suggestion)
+
+        def on_stream_get(pixbuf, suggestion):
+            state["icons"] += 1
+            done()
+
+        request = Request()
+        stream = Stream(request)
+        stream.StreamGet = on_stream_get
+        server = Server(request)
+        server.ServerGet = on_server_get
+
+        # Also called for a 304, which does not reach ServerGet
+        on_response = server._on_response
+
+        def on_response_done(response, cache):
+            on_response(response, cache)
+            state["responded"] = True
+            done()
+
+        server._on_response = on_response_done
+
+        start = time.perf_counter()
+        server.get(stand_in.url + "/api/greeter")
+        run_loop(loop)
+        return time.perf_counter() - start
+
+    try:
+        return {"fetch_cold_s": fetch(), "fetch_warm_s": fetch()}
+    finally:
+        stand_in.stop()
+
+
+# - theme
+def case_theme(args, workdir):
+    import ThemeManager
+
+    results = {}
+    start = time.perf_counter()
+    for i in range(args.n):
+        ThemeManager.get_gtk_theme()
+        ThemeManager.get_icon_theme()
+        ThemeManager.get_cinnamon_theme()
+    results["get_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(args.n):
+        theme = "eta" if i % 2 else "eta-dark"
+        ThemeManager.set_theme(theme, theme, theme)
+    results["set_s"] = time.perf_counter() - start
+
+    # Fails if the writes did not go through GSettings
+    current = (ThemeManager.get_gtk_theme(), ThemeManager.get_icon_theme(), ThemeManager.get_cinnamon_theme())
+    if current != (theme, theme, theme):
+        raise RuntimeError("theme is {} after setting {}".format(current, theme))
+    return results
+
+
+# - user_settings
+def case_user_settings(args, workdir):
+    from UserSettings import UserSettings
+
+    user_settings = UserSettings()
+    user_settings.createDefaultConfig()
+
+    results = {}
+    start = time.perf_counter()
+    for i in range(args.n):
+        user_settings.writeConfig(i % 2 == 0)
+    results["write_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(args.n):
+        UserSettings().readConfig()
+    results["read_s"] = time.perf_counter() - start
+    return results
+
+
+def run_case(args):
+    results = globals()["case_" + args.run_case](args, args.workdir)
+    # ru_maxrss is in kilobytes on Linux
+    results["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print("RESULT " + json.dumps(results))
+
+
+def get_case_env(case, workdir):
+    env = dict(os.environ,
+               HOME=os.path.join(workdir, "home"),
+               XDG_CACHE_HOME=os.path.join(workdir, "cache"),
+               XDG_CONFIG_HOME=os.path.join(workdir, "config"))
+    env.pop("http_proxy", None)
+    env.pop("HTTP_PROXY", None)
+    os.makedirs(env["HOME"], exist_ok=True)
+
+    if case == "theme":
+        schema_dir = os.path.join(workdir, "schemas")
+        os.makedirs(schema_dir)
+        subprocess.check_call(["glib-compile-schemas", "--targetdir", schema_dir,
+                               os.path.join(benchmarks_dir, "schemas")])
+        env["GSETTINGS_SCHEMA_DIR"] = schema_dir
+        env["GSETTINGS_BACKEND"] = "memory"
+    return env
+
+
+def measure_once(case, args):
+    workdir = tempfile.mkdtemp(prefix="eta-greeter-bench-")
+    try:
+        command = [sys.executable, os.path.abspath(__file__), "--run-case", case, "--workdir", workdir,
+                   "-n", str(args.n), "--images", str(args.images),
+                   "--suggestions", str(args.suggestions), "--latency", str(args.latency)]
+        output = subprocess.run(command, env=get_case_env(case, workdir), stdout=subprocess.PIPE, check=True)
+        for line in output.stdout.decode("utf-8").splitlines():
+            if line.startswith("RESULT "):
+                return json.loads(line[len("RESULT "):])
+        raise RuntimeError("{} reported no result".format(case))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def measure(case, args):
+    # Median of each metric over --repeat runs, a single run is too noisy to compare
+    runs = [measure_once(case, args) for i in range(args.repeat)]
+    return {metric: sorted(run[metric] for run in runs)[len(runs) // 2] for metric in runs[0]}
+
+
+def compare(value, baseline, tolerance):
+    if baseline is None:
+        return "no baseline"
+    change = (value - baseline) / baseline if baseline else 0
+    status = "REGRESSION" if change > tolerance else "ok"
+    return "{:+.0%} {}".format(change, status)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", default=",".join(cases), help="comma separated, default: all")
+    parser.add_argument("--baseline", default=os.path.join(benchmarks_dir, "baselines.json"))
+    parser.add_argument("--save", action="store_true", help="store the results as the new baselines")
+    parser.add_argument("--time-tolerance", type=float, default=0.25)
+    parser.add_argument("--rss-tolerance", type=float, default=0.15)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case, the median is reported")
+    parser.add_argument("-n", type=int, default=2000, help="iterations of the theme and user_settings cases")
+    parser.add_argument("--images", type=int, default=40, help="images in the synthetic wallpaper tree")
+    parser.add_argument("--suggestions", type=int, default=24, help="suggestions served by the stand-in")
+    parser.add_argument("--latency", type=int, default=50, help="stand-in latency per request in ms")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        run_case(args)
+        return
+
+    try:
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+    except (OSError, ValueError):
+        baselines = {}
+
+    results = {}
+    regressions = 0
+    missing = 0
+    failed = []
+    print("{:<15} {:<18} {:>10} {:>10}  {}".format("case", "metric", "value", "baseline", "change"))
+    for case in args.cases.split(","):
+        if case not in cases:
+            parser.error("unknown case: {}".format(case))
+        try:
+            results[case] = measure(case, args)
+        except subprocess.CalledProcessError as e:
+            # The case's traceback went to stderr, carry on with the other cases
+            print("{:<15} FAILED (exit status {})".format(case, e.returncode))
+            failed.append(case)
+            continue
+        except (RuntimeError, ValueError) as e:
+            print("{:<15} FAILED ({})".format(case, e))
+            failed.append(case)
+            continue
+        for metric, value in results[case].items():
+            baseline = baselines.get(case, {}).get(metric)
+            tolerance = args.rss_tolerance if metric == "peak_rss_mb" else args.time_tolerance
+            status = compare(value, baseline, tolerance)
+            regressions += status.endswith("REGRESSION")
+            missing += baseline is None
+            print("{:<15} {:<18} {:>10.3f} {:>10}  {}".format(
+                case, metric, value, "-" if baseline is None else "{:.3f}".format(baseline), status))
+
+    if missing and not args.save:
+        print("warning: {} metrics have no baseline, record them on the CI box with --save".format(missing))
+
+    if args.save:
+        baselines.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print("baselines saved to {}".format(args.baseline))
+
+    if failed:
+        print("failed cases: {}".format(", ".join(failed)))
+    sys.exit(1 if failed or (regressions and not args.save) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Compare switching the theme with one gsettings process per key against
+ThemeManager's cached in-process Gio.Settings.
+
+The schemas in benchmarks/schemas are compiled into a temporary directory and
+the memory GSettings backend is used, so the user's settings are not touched.
+Pass --dconf to measure against the real dconf backend instead.
+
+usage: python3 benchmarks/theme_manager.py [-n 20] [--dconf]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(benchmarks_dir, "..", "src"))
+
+
+def fork_per_key(theme):
+    subprocess.call(["gsettings", "set", "org.cinnamon.desktop.interface", "gtk-theme", f"'{theme}'"])
+    subprocess.call(["gsettings", "set", "org.cinnamon.desktop.interface", "icon-theme", f"'{theme}'"])
+    subprocess.call(["gsettings", "set", "org.cinnamon.theme", "name", f"'{theme}'"])
+
+
+def measure(function, iterations):
+    timings = []
+    for i in range(iterations):
+        theme = "eta" if i % 2 else "eta-dark"
+        start = time.perf_counter()
+        function(theme)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2], timings[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=20, help="theme switches per mode")
+    parser.add_argument("--dconf", action="store_true", help="use the real dconf backend")
+    args = parser.parse_args()
+
+    schema_dir = tempfile.mkdtemp(prefix="eta-greeter-schemas-")
+    subprocess.check_call(["glib-compile-schemas", "--targetdir", schema_dir, os.path.join(benchmarks_dir, "schemas")])
+    os.environ["GSETTINGS_SCHEMA_DIR"] = schema_dir
+    if not args.dconf:
+        os.environ["GSETTINGS_BACKEND"] = "memory"
+
+    import ThemeManager
+
+    print("{:<14} {:>12} {:>12}".format("mode", "median (ms)", "max (ms)"))
+    for name, function in (("fork-per-key", fork_per_key),
+                           ("in-process", lambda theme: ThemeManager.set_theme(theme, theme, theme))):
+        median, worst = measure(function, args.n)
+        print("{:<14} {:>12.2f} {:>12.2f}".format(name, median * 1000, worst * 1000))
+
+
+if __name__ == "__main__":
+    main()
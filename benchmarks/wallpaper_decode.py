@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Compare wallpaper thumbnail generation with and without decode-at-size.
+
+Each mode runs in its own process so the reported peak RSS (ru_maxrss) is the
+memory high-water mark of that mode alone.
+
+usage: python3 benchmarks/wallpaper_decode.py [/usr/share/backgrounds]
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+
+def run_mode(directory, decode_at_size):
+    from ThumbnailCache import ThumbnailCache
+
+    cache = ThumbnailCache(240, 135, decode_at_size=decode_at_size)
+    paths = sorted(os.path.join(directory, name) for name in os.listdir(directory))
+
+    count = 0
+    start = time.perf_counter()
+    for path in paths:
+        try:
+            cache.create(path)
+            count += 1
+        except Exception as e:
+            print("skip {}: {}".format(path, e), file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print("{} {:.3f} {}".format(count, elapsed, peak_rss))
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--mode":
+        run_mode(sys.argv[3], sys.argv[2] == "at-size")
+        return
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else "/usr/share/backgrounds"
+    print("{:<10} {:>7} {:>10} {:>14}".format("mode", "images", "time (s)", "peak RSS (MB)"))
+    for mode in ("full", "at-size"):
+        output = subprocess.check_output([sys.executable, os.path.abspath(__file__), "--mode", mode, directory])
+        count, elapsed, peak_rss = output.decode("utf-8").split()
+        print("{:<10} {:>7} {:>10} {:>14.1f}".format(mode, count, elapsed, int(peak_rss) / 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 
 import os
 import subprocess
+import sys
 
 from setuptools import setup, find_packages
 
@@ -21,6 +22,34 @@ def create_mo_files():
     return mo
 
 
+def create_artwork():
+    datadir = "/usr/share/pardus/eta-cinnamon-greeter/data"
+    render_cmd = [sys.executable, "src/Artwork.py", "data/artwork"]
+    try:
+        if subprocess.call(render_cmd) == 0:
+            return [(datadir + "/artwork", ["data/artwork/" + png for png in sorted(os.listdir("data/artwork"))])]
+    except OSError as e:
+        print("{}".format(e))
+    # The application renders the previews from the original images when the artwork is missing
+    print("rendering artwork failed, installing original images")
+    return [(datadir, ["data/theme-dark.png", "data/theme-light.png", "data/pardus-night-light-ss.png"])]
+
+
+def create_gresource():
+    uidir = "/usr/share/pardus/eta-cinnamon-greeter/ui"
+    compile_cmd = ["glib-compile-resources", "--sourcedir=ui", "--target=ui/eta-cinnamon-greeter.gresource",
+                   "ui/eta-cinnamon-greeter.gresource.xml"]
+    try:
+        if subprocess.call(compile_cmd) == 0:
+            return [(uidir, ["ui/eta-cinnamon-greeter.gresource"])]
+    except OSError as e:
+        print("{}".format(e))
+    # The application loads the ui files directly when the bundle is missing
+    print("glib-compile-resources failed, installing ui files")
+    pages = ["ui/pages/" + ui for ui in sorted(os.listdir("ui/pages")) if ui.endswith(".ui")]
+    return [(uidir, ["ui/MainWindow.glade"]), (uidir + "/pages", pages)]
+
+
 changelog = "debian/changelog"
 version = "0.1.0"
 if os.path.exists(changelog):
@@ -37,28 +66,42 @@ data_files = [
  ("/usr/share/applications/", ["data/tr.org.pardus.eta-cinnamon-greeter.desktop"]),
  ("/usr/share/pardus/eta-cinnamon-greeter/data",
   ["data/eta-cinnamon-greeter.svg", "data/discord.svg", "data/github.svg",
-   "data/tr.org.pardus.eta-cinnamon-greeter.desktop", "data/sample.m4a",
-   "data/theme-dark.png", "data/theme-light.png", "data/pardus-night-light-ss.png"]),
+   "data/tr.org.pardus.eta-cinnamon-greeter-autostart.desktop", "data/sample.m4a"]),
  ("/usr/share/pardus/eta-cinnamon-greeter/data/css",
   ["data/css/style.css"]
   ),
  ("/usr/share/pardus/eta-cinnamon-greeter/src",
   ["src/Main.py",
+   "src/Application.py",
+   "src/Artwork.py",
    "src/MainWindow.py",
+   "src/IdleQueue.py",
+   "src/DisplayConfig.py",
+   "src/PageManager.py",
+   "src/Profiler.py",
+   "src/Resources.py",
    "src/Server.py",
+   "src/Request.py",
    "src/Stream.py",
+   "src/Suggestion.py",
    "src/UserSettings.py",
    "src/utils.py",
+   "src/Dialogs.py",
    "src/WallpaperManager.py",
+   "src/WallpaperLoader.py",
    "src/ScaleManager.py",
+   "src/SettingsRegistry.py",
+   "src/SoundDevices.py",
+   "src/SoundPlayer.py",
    "src/ThemeManager.py",
+   "src/ThumbnailCache.py",
    "src/__version__"]
   ),
- ("/usr/share/pardus/eta-cinnamon-greeter/ui", ["ui/MainWindow.glade"]),
  ("/usr/bin/", ["eta-cinnamon-greeter"]),
- ("/etc/skel/.config/autostart", ["data/tr.org.pardus.eta-cinnamon-greeter.desktop"]),
+ ("/usr/share/dbus-1/services/", ["data/tr.org.pardus.eta-cinnamon-greeter.service"]),
+ ("/etc/skel/.config/autostart", ["data/tr.org.pardus.eta-cinnamon-greeter-autostart.desktop"]),
  ("/usr/share/icons/hicolor/scalable/apps/", ["data/eta-cinnamon-greeter.svg"])
-] + create_mo_files()
+] + create_artwork() + create_gresource() + create_mo_files()
 
 setup(
     name="ETA Greeter",
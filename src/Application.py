@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+from Profiler import profiler
+
+with profiler.phase("import gi"):
+    import gi
+
+    gi.require_version('Gtk', '3.0')
+    from gi.repository import Gio, GLib, Gtk
+
+pages = ["welcome", "display", "sound", "theme", "wallpaper", "nightlight", "applications", "support"]
+
+
+class Application(Gtk.Application):
+    """Single instance greeter.
+
+    A second launch only forwards its command line to the running instance
+    over D-Bus, which raises the window and handles --page there. The window
+    can also be driven with the "show-page" action, e.g.
+    gapplication action tr.org.pardus.eta-cinnamon-greeter show-page "'wallpaper'"
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, application_id="tr.org.pardus.eta-cinnamon-greeter",
+                         flags=Gio.ApplicationFlags.HANDLES_COMMAND_LINE, **kwargs)
+        self.window = None
+
+        self.add_main_option("page", ord("p"), GLib.OptionFlags.NONE, GLib.OptionArg.STRING,
+                             "Show the page NAME ({})".format(", ".join(pages)), "NAME")
+
+    def do_startup(self):
+        Gtk.Application.do_startup(self)
+
+        action = Gio.SimpleAction.new("show-page", GLib.VariantType.new("s"))
+        action.connect("activate", self.on_show_page)
+        self.add_action(action)
+
+    def do_activate(self):
+        # We only allow a single window and raise any existing ones
+        if not self.window:
+            # MainWindow is imported here, a second instance only forwards its command line
+            with profiler.phase("import MainWindow"):
+                from MainWindow import MainWindow
+
+            # Windows are associated with the application
+            # when the last one is closed the application shuts down
+            with profiler.phase("MainWindow"):
+                self.window = MainWindow(self)
+        self.window.window.present()
+
+    def do_command_line(self, command_line):
+        options = command_line.get_options_dict().end().unpack()
+        if "page" in options:
+            self.activate_action("show-page", GLib.Variant("s", options["page"]))
+        else:
+            self.activate()
+        return 0
+
+    def on_show_page(self, action, parameter):
+        self.activate()
+        self.window.show_page(parameter.get_string())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+import gi
+
+gi.require_version("Gdk", "3.0")
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import Gdk, GdkPixbuf, GLib
+
+data_dir = os.path.dirname(os.path.abspath(__file__)) + "/../data"
+artwork_dir = data_dir + "/artwork"
+
+# Preview images and the box they are shown in, in application pixels
+artwork = {
+    "theme-light": (350, 276),
+    "theme-dark": (350, 276),
+    "pardus-night-light-ss": (500, 222),
+}
+
+# Scale factors rendered at install time, larger factors use the largest one
+scales = (1, 2)
+
+
+def get_scale(scale_factor):
+    return max(scales[0], min(scale_factor, scales[-1]))
+
+
+def get_path(name, scale):
+    return "{}/{}@{}x.png".format(artwork_dir, name, scale)
+
+
+def render(name, scale):
+    # Decoded at the box size, keeping the aspect ratio
+    width, height = artwork[name]
+    return GdkPixbuf.Pixbuf.new_from_file_at_scale(
+        "{}/{}.png".format(data_dir, name), width * scale, height * scale, True)
+
+
+def load(name, scale):
+    try:
+        return GdkPixbuf.Pixbuf.new_from_file(get_path(name, scale))
+    except GLib.Error:
+        # Not rendered at install time, e.g. running from the source tree
+        return render(name, scale)
+
+
+def set_image(image, name):
+    """Shows artwork name on a Gtk.Image, rendered for the image's scale
+    factor. The image follows later scale factor changes, e.g. when the window
+    is moved to a HiDPI monitor."""
+
+    def update(*args):
+        scale = get_scale(image.get_scale_factor())
+        image.set_from_surface(Gdk.cairo_surface_create_from_pixbuf(load(name, scale), scale, None))
+
+    update()
+    image.connect("notify::scale-factor", update)
+
+
+def render_all(directory):
+    os.makedirs(directory, exist_ok=True)
+    for name in artwork:
+        for scale in scales:
+            render(name, scale).savev("{}/{}@{}x.png".format(directory, name, scale), "png", [], [])
+
+
+if __name__ == "__main__":
+    # Called by setup.py to render the artwork at install time
+    render_all(sys.argv[1] if len(sys.argv) > 1 else artwork_dir)
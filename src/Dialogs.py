@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+
+import gi
+
+gi.require_version('Gtk', '3.0')
+from gi.repository import Gtk
+
+
+class Dialog(Gtk.MessageDialog):
+    def __init__(self, style, buttons, title, text, text2=None, parent=None):
+        Gtk.MessageDialog.__init__(self, parent, 0, style, buttons)
+        self.set_position(Gtk.WindowPosition.CENTER)
+        self.set_title(title)
+        self.set_markup(text)
+
+    def show(self):
+        try:
+            response = self.run()
+        finally:
+            self.destroy()
+
+
+def ErrorDialog(*args):
+    dialog = Dialog(Gtk.MessageType.ERROR, Gtk.ButtonsType.NONE, *args)
+    dialog.add_button("OK", Gtk.ResponseType.OK)
+    return dialog.show()
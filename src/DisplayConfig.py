@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import gi
+
+gi.require_version("Gio", "2.0")
+from gi.repository import Gio, GLib
+
+
+class Mode(object):
+    __slots__ = ("id", "width", "height", "refresh", "preferred_scale", "supported_scales", "is_current",
+                 "is_preferred")
+
+    def __init__(self, mode_id, width, height, refresh, preferred_scale, supported_scales, properties):
+        self.id = mode_id
+        self.width = width
+        self.height = height
+        self.refresh = refresh
+        self.preferred_scale = preferred_scale
+        self.supported_scales = supported_scales
+        self.is_current = properties.get("is-current", False)
+        self.is_preferred = properties.get("is-preferred", False)
+
+    @property
+    def resolution(self):
+        return self.width, self.height
+
+
+class Monitor(object):
+    """A physical monitor with its modes indexed by resolution.
+
+    modes_by_resolution maps (width, height) to the modes of that resolution,
+    highest refresh rate first, so best_mode() is a single dict lookup.
+    """
+
+    def __init__(self, monitor_info, modes, properties):
+        self.connector, self.vendor, self.product, self.serial = monitor_info
+        self.properties = properties
+        self.modes = [Mode(*mode) for mode in modes]
+
+        self.modes_by_resolution = {}
+        for mode in sorted(self.modes, key=lambda m: m.refresh, reverse=True):
+            self.modes_by_resolution.setdefault(mode.resolution, []).append(mode)
+
+        self.current_mode = next((mode for mode in self.modes if mode.is_current), None)
+        # Filled from the logical monitor this monitor belongs to, if it is enabled
+        self.scale = None
+        self.primary = False
+
+    def best_mode(self, width, height):
+        modes = self.modes_by_resolution.get((width, height))
+        return modes[0] if modes else None
+
+
+def parse_state(physical_monitors, logical_monitors):
+    """Returns {connector: Monitor} for a GetCurrentState reply."""
+    monitors = {}
+    for monitor_info, modes, properties in physical_monitors:
+        monitor = Monitor(monitor_info, modes, properties)
+        monitors[monitor.connector] = monitor
+
+    for x, y, scale, transform, primary, linked_monitors_info, properties in logical_monitors:
+        for connector, vendor, product, serial in linked_monitors_info:
+            if connector in monitors:
+                monitors[connector].scale = scale
+                monitors[connector].primary = primary
+
+    return monitors
+
+
+def get_primary_monitor(monitors):
+    enabled = [monitor for monitor in monitors.values() if monitor.scale is not None]
+    for monitor in enabled:
+        if monitor.primary:
+            return monitor
+    return enabled[0] if enabled else None
+
+
+class DisplayConfig(object):
+    """Asynchronous client of the Muffin/Mutter DisplayConfig D-Bus interface.
+
+    watch() creates the proxy and queries GetCurrentState without blocking the
+    main loop. callback(serial, physical_monitors, logical_monitors, properties)
+    is called with the unpacked state, and again whenever the compositor emits
+    MonitorsChanged.
+    """
+
+    def __init__(self, name="org.cinnamon.Muffin.DisplayConfig", path="/org/cinnamon/Muffin/DisplayConfig",
+                 timeout=5000):
+        self.name = name
+        self.path = path
+        self.timeout = timeout
+        self.proxy = None
+        self.callback = None
+        self.cancellable = Gio.Cancellable()
+
+    def watch(self, callback):
+        self.callback = callback
+        Gio.DBusProxy.new_for_bus(Gio.BusType.SESSION, Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES, None,
+                                  self.name, self.path, self.name, self.cancellable, self._on_proxy_ready)
+
+    def cancel(self):
+        self.cancellable.cancel()
+
+    def get_current_state(self):
+        self.proxy.call("GetCurrentState", None, Gio.DBusCallFlags.NONE, self.timeout, self.cancellable,
+                        self._on_current_state)
+
+    def _on_proxy_ready(self, source, result):
+        try:
+            self.proxy = Gio.DBusProxy.new_for_bus_finish(result)
+        except GLib.Error as error:
+            print("DisplayConfig proxy Error: {}, {}".format(error.domain, error.message))
+            return
+
+        self.proxy.connect("g-signal", self._on_signal)
+        self.get_current_state()
+
+    def _on_current_state(self, proxy, result):
+        try:
+            state = proxy.call_finish(result).unpack()
+        except GLib.Error as error:
+            print("GetCurrentState Error: {}, {}".format(error.domain, error.message))
+            return
+
+        self.callback(*state)
+
+    def _on_signal(self, proxy, sender_name, signal_name, parameters):
+        # MonitorsChanged carries no arguments, the new state has to be fetched
+        if signal_name == "MonitorsChanged":
+            self.get_current_state()
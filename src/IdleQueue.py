@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from collections import deque
+
+import gi
+
+gi.require_version("GLib", "2.0")
+from gi.repository import GLib
+
+
+class IdleQueue(object):
+    """Coalesces work for the GTK main loop into frame-budgeted batches.
+
+    Items can be pushed from any thread. A single idle source drains the queue,
+    calling handler for each item until budget seconds have passed, and then
+    yields back to the main loop until the next tick. on_drained is called
+    once the queue runs empty.
+    """
+
+    def __init__(self, handler, on_drained=None, budget=0.008, priority=GLib.PRIORITY_DEFAULT_IDLE):
+        self.handler = handler
+        self.on_drained = on_drained
+        self.budget = budget
+        self.priority = priority
+
+        self.items = deque()
+        self.lock = threading.Lock()
+        self.source_id = None
+        self.dispatches = 0
+
+    def push(self, *item):
+        with self.lock:
+            self.items.append(item)
+            if self.source_id is None:
+                self.source_id = GLib.idle_add(self._dispatch, priority=self.priority)
+
+    def cancel(self):
+        with self.lock:
+            self.items.clear()
+            if self.source_id is not None:
+                GLib.source_remove(self.source_id)
+                self.source_id = None
+
+    def _dispatch(self):
+        self.dispatches += 1
+        deadline = time.monotonic() + self.budget
+        while time.monotonic() < deadline:
+            with self.lock:
+                if not self.items:
+                    self.source_id = None
+                    break
+                item = self.items.popleft()
+            self.handler(*item)
+        else:
+            return GLib.SOURCE_CONTINUE
+
+        if self.on_drained is not None:
+            self.on_drained()
+        return GLib.SOURCE_REMOVE
@@ -1,27 +1,66 @@
 #!/usr/bin/env python3
 
-import gi
+# Only the standard library is imported before should_greet() has decided,
+# so a session that is not greeted exits without loading GI or GTK
 
-gi.require_version('Gtk', '3.0')
-from gi.repository import Gio, Gtk
+import os
+import sys
 
-from MainWindow import MainWindow
+import utils
+from Profiler import profiler
+from UserSettings import UserSettings
 
 
-class Application(Gtk.Application):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, application_id="tr.org.pardus.eta-cinnamon-greeter",
-                         flags=Gio.ApplicationFlags.NON_UNIQUE, **kwargs)
-        self.window = None
+def should_greet(autostart):
+    # Opened by the user, from the menu or over D-Bus
+    if not autostart:
+        return True
 
-    def do_activate(self):
-        # We only allow a single window and raise any existing ones
-        if not self.window:
-            # Windows are associated with the application
-            # when the last one is closed the application shuts down
-            self.window = MainWindow(self)
-        self.window.window.present()
+    # In live mode, the application should not welcome the user
+    if utils.check_live():
+        return False
 
+    # The user turned the greeter off but an autostart entry is still there
+    user_settings = UserSettings()
+    if os.path.isfile(user_settings.configdir + user_settings.configfile):
+        user_settings.readConfig()
+        if not user_settings.config_autostart:
+            return False
+    return True
 
-app = Application()
-app.run()
+
+def get_version():
+    try:
+        return open(os.path.dirname(os.path.abspath(__file__)) + "/__version__").readline().strip()
+    except OSError:
+        return ""
+
+
+def main(argv=None):
+    argv = list(sys.argv if argv is None else argv)
+
+    # --trace <file> enables the startup profiler, see Profiler.py
+    if "--trace" in argv[1:-1]:
+        index = argv.index("--trace")
+        profiler.enable(argv[index + 1])
+        del argv[index:index + 2]
+
+    # Only the autostart entry passes --autostart, it is not D-Bus activatable
+    autostart = "--autostart" in argv[1:]
+    if autostart:
+        argv.remove("--autostart")
+
+    with profiler.phase("should_greet"):
+        if not should_greet(autostart):
+            return 0
+
+    from Application import Application
+
+    app = Application()
+    status = app.run(argv)
+    profiler.save({"version": get_version()})
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,18 @@
 #!/usr/bin/env python3
 
+import bisect
+import dataclasses
 import os
 import subprocess
-import threading
-import time
 
-import dbus
 import gi
 
-import utils
-from utils import ErrorDialog
+from Dialogs import ErrorDialog
 
 gi.require_version('Gtk', '3.0')
-gi.require_version('Gst', '1.0')
-gi.require_version('Cvc', '1.0')
-from gi.repository import Gio, Gtk, GdkPixbuf, GLib, Gdk, Gst, Cvc
+from gi.repository import Gio, Gtk, GLib, Gdk
 import locale
 from locale import gettext as _
-from pathlib import Path
 from configparser import ConfigParser
 from locale import getlocale
 from UserSettings import UserSettings
@@ -47,35 +42,28 @@ def get_current_desktop():
 
 import WallpaperManager as WallpaperManager
 import ThemeManager as ThemeManager
+import Artwork as Artwork
 
 from Server import Server
 from Stream import Stream
-
-autostart_file = str(Path.home()) + "/.config/autostart/tr.org.pardus.eta-cinnamon-greeter.desktop"
-
-# Let the application greet the user only on the first boot
-try:
-    if os.path.exists(autostart_file):
-        os.remove(autostart_file)
-except OSError:
-    pass
-
-# In live mode, the application should not welcome the user
-if utils.check_live() and os.path.isfile(autostart_file):
-    exit(0)
+from Request import Request
+from Suggestion import parse_suggestions
+from Profiler import profiler
+from DisplayConfig import DisplayConfig, parse_state, get_primary_monitor
+from IdleQueue import IdleQueue
+from ThumbnailCache import ThumbnailCache
+from WallpaperLoader import WallpaperLoader
+from PageManager import PageManager
+from Resources import new_builder
 
 
 class MainWindow:
     def __init__(self, application):
         self.Application = application
 
-        # Gtk Builder
-        self.builder = Gtk.Builder()
-        self.builder.add_from_file(os.path.dirname(os.path.abspath(__file__)) + "/../ui/MainWindow.glade")
-        self.builder.connect_signals(self)
-
-        # Translate things on glade:
-        self.builder.set_translation_domain(APPNAME)
+        # Gtk Builder, the pages are built from their own ui files when they are prepared
+        with profiler.phase("builder"):
+            self.builder = new_builder("MainWindow.glade", self, APPNAME)
 
         # Add Window
         self.window = self.builder.get_object("window")
@@ -86,41 +74,35 @@ class MainWindow:
 
         self.user_locale = self.get_user_locale()
 
-        self.set_css()
+        with profiler.phase("set_css"):
+            self.set_css()
 
-        self.define_components()
+        with profiler.phase("define_components"):
+            self.define_components()
         self.define_variables()
+        self.define_pages()
 
-        self.get_monitor_resolution()
-        self.add_sound_devices()
-
-        self.user_settings()
-        self.UserSettings.set_autostart(self.UserSettings.config_autostart)
-        self.chkbtn_autostart.set_active(self.UserSettings.config_autostart)
-
-        # Put Wallpapers on a Grid
-        thread = threading.Thread(target=self.add_wallpapers, args=(WallpaperManager.get_wallpapers(),))
-        thread.daemon = True
-        thread.start()
-
-        # set pardus-software apps
-        self.set_pardussoftware_apps()
-
-        self.set_active_theme()
-
-        self.set_initial_nightlight_status()
+        with profiler.phase("user_settings"):
+            self.user_settings()
+            # Only the primary instance gets here, a second launch is forwarded to it
+            self.UserSettings.remove_autostart()
+            self.UserSettings.set_autostart(self.UserSettings.config_autostart)
+            self.chkbtn_autostart.set_active(self.UserSettings.config_autostart)
 
         # Show Screen:
-        self.window.show_all()
+        with profiler.phase("show_all"):
+            self.window.show_all()
+
+        if profiler.enabled:
+            self.first_frame_handler = self.window.get_frame_clock().connect("after-paint", self.on_first_frame)
 
         # Hide widgets:
         self.hide_widgets()
 
         self.set_signals()
 
-        thread_sound = threading.Thread(target=self.select_sound_device)
-        thread_sound.daemon = True
-        thread_sound.start()
+        # Only the welcome page is prepared now, the next one follows once the window is idle
+        self.pages.approach(self.stk_pages.get_visible_child())
 
     def get_user_locale(self):
         try:
@@ -229,51 +211,11 @@ class MainWindow:
         self.page_support.name = _("Support & Community")
         self.page_nightlight.name = _("Night Light")
 
-        # - Display Settings:
-        self.flow_wallpapers = get_ui("flow_wallpapers")
-        self.lbl_current_res = get_ui("lbl_current_res")
-
-        self.btn_4k = get_ui("btn_4k")
-        self.btn_fullhd = get_ui("btn_fullhd")
-
-        # - Night Light:
-        self.ui_night_switch = get_ui("ui_night_switch")
-        self.ui_temp_box = get_ui("ui_temp_box")
-        self.ui_temp_adjusment = get_ui("ui_temp_adjusment")
-        self.ui_nightlight_settings_box = get_ui("ui_nightlight_settings_box")
-        self.ui_temp_box = get_ui("ui_temp_box")
-        self.ui_nightlight_stack = get_ui("ui_nightlight_stack")
-        self.ui_temp_low_button = get_ui("ui_temp_low_button")
-        self.ui_temp_medium_button = get_ui("ui_temp_medium_button")
-        self.ui_temp_high_button = get_ui("ui_temp_high_button")
-
         self.chkbtn_autostart = get_ui("chkbtn_autostart")
 
         tabTitle = self.stk_pages.get_visible_child().name
         self.lbl_headerTitle.set_text(tabTitle)
 
-        self.ui_apps_flowbox = get_ui("ui_apps_flowbox")
-        self.ui_apps_error_label = get_ui("ui_apps_error_label")
-        self.ui_apps_stack = get_ui("ui_apps_stack")
-
-        self.sound_listbox = get_ui("sound_listbox")
-
-        self.img_lightTheme = get_ui("img_lightTheme")
-        self.img_darkTheme = get_ui("img_darkTheme")
-
-        self.rb_darkTheme = get_ui("rb_darkTheme")
-        self.rb_lightTheme = get_ui("rb_lightTheme")
-
-        self.img_nightlight = get_ui("img_nightlight")
-
-        self.img_lightTheme.set_from_pixbuf(GdkPixbuf.Pixbuf.new_from_file_at_scale(
-            os.path.dirname(os.path.abspath(__file__)) + "/../data/theme-light.png", 350, 276, False))
-        self.img_darkTheme.set_from_pixbuf(GdkPixbuf.Pixbuf.new_from_file_at_scale(
-            os.path.dirname(os.path.abspath(__file__)) + "/../data/theme-dark.png", 350, 276, False))
-
-        self.img_nightlight.set_from_pixbuf(GdkPixbuf.Pixbuf.new_from_file_at_scale(
-            os.path.dirname(os.path.abspath(__file__)) + "/../data/pardus-night-light-ss.png", 500, 222, False))
-
     def define_variables(self):
         self.currentpage = 0
         self.stk_len = 0
@@ -281,6 +223,7 @@ class MainWindow:
             self.stk_len += 1
 
         self.apps_url = "https://apps.pardus.org.tr/api/greeter"
+        self.request = Request()
         self.non_tls_tried = False
 
         self.current_res = ""
@@ -289,21 +232,138 @@ class MainWindow:
         self.fullhd_found = False
         self.hidpi_res = None
         self.fullhd_res = None
+        self.monitors = {}
+        self.display_config = None
 
         self.temp_color = {"low": 5500, "medium": 4000, "high": 2500}
 
+        self.thumbnail_cache = ThumbnailCache(240, 135)
+        self.wallpaper_queue = IdleQueue(self.set_wallpaper_thumbnail)
+        self.wallpaper_loader = WallpaperLoader(self.thumbnail_cache)
+        self.wallpaper_index = WallpaperManager.WallpaperIndex()
+        self.sound_player = None
+        self.wallpapers_added = False
+        self.wallpaper_tiles = {}
+        self.visible_wallpapers_source = None
+
+        self.config_nightlight_status = False
+
+    def define_pages(self):
+        # Each page is prepared when the user gets close to it, see PageManager
+        self.pages = PageManager(self.stk_pages, prefetch=1)
+        self.pages.on_ready = self.page_interactive
+        self.pages.register(self.page_welcome, self.prepare_welcome_page)
+        self.pages.register(self.page_display, self.prepare_display_page)
+        self.pages.register(self.page_sound, self.prepare_sound_page)
+        self.pages.register(self.page_theme, self.prepare_theme_page)
+        self.pages.register(self.page_wallpaper, self.prepare_wallpaper_page)
+        self.pages.register(self.page_nightlight, self.prepare_nightlight_page)
+        self.pages.register(self.page_applications, self.prepare_applications_page)
+        self.pages.register(self.page_support, self.prepare_support_page)
+
     # =========== UI Preparing functions:
     def hide_widgets(self):
 
         self.btn_prev.set_sensitive(self.currentpage != 0)
+
+    def set_signals(self):
+        self.stk_pages.connect("notify::visible-child", self.on_stk_pages_visible_child_changed)
+
+    # =========== Page preparing functions:
+    def build_page(self, page, name):
+        # Creates the page's widgets inside its placeholder in stk_pages
+        with profiler.phase("build_page: {}".format(name)):
+            builder = new_builder("pages/{}.ui".format(name), self, APPNAME)
+            content = builder.get_object("{}_content".format(Gtk.Buildable.get_name(page)))
+            page.pack_start(content, True, True, 0)
+            content.show_all()
+        return builder
+
+    def prepare_welcome_page(self):
+        self.build_page(self.page_welcome, "welcome")
+        self.pages.ready(self.page_welcome)
+
+    def prepare_display_page(self):
+        builder = self.build_page(self.page_display, "display")
+        self.lbl_current_res = builder.get_object("lbl_current_res")
+        self.btn_4k = builder.get_object("btn_4k")
+        self.btn_fullhd = builder.get_object("btn_fullhd")
         self.btn_fullhd.set_sensitive(self.fullhd_found)
         self.btn_4k.set_sensitive(self.hidpi_found)
-        self.ui_temp_box.set_visible(self.config_nightlight_status)
 
-    def set_signals(self):
+        with profiler.phase("get_monitor_resolution"):
+            self.get_monitor_resolution()
+
+    def prepare_sound_page(self):
+        # GStreamer and Cvc (see add_sound_devices) are loaded only when the sound page is prepared
+        from SoundPlayer import SoundPlayer
+
+        builder = self.build_page(self.page_sound, "sound")
+        self.sound_listbox = builder.get_object("sound_listbox")
+        self.sound_player = SoundPlayer(os.path.dirname(os.path.abspath(__file__)) + "/../data/sample.m4a")
+
+        with profiler.phase("add_sound_devices"):
+            self.add_sound_devices()
+        self.pages.ready(self.page_sound)
+
+    def prepare_theme_page(self):
+        builder = self.build_page(self.page_theme, "theme")
+        self.img_lightTheme = builder.get_object("img_lightTheme")
+        self.img_darkTheme = builder.get_object("img_darkTheme")
+        self.rb_darkTheme = builder.get_object("rb_darkTheme")
+        self.rb_lightTheme = builder.get_object("rb_lightTheme")
+
+        with profiler.phase("set_active_theme"):
+            Artwork.set_image(self.img_lightTheme, "theme-light")
+            Artwork.set_image(self.img_darkTheme, "theme-dark")
+            self.set_active_theme()
+        # Connected after the current theme is shown, so showing it does not apply it again
         self.rb_lightTheme.connect("clicked", self.on_rb_lightTheme_clicked)
         self.rb_darkTheme.connect("clicked", self.on_rb_darkTheme_clicked)
+        self.pages.ready(self.page_theme)
+
+    def prepare_wallpaper_page(self):
+        builder = self.build_page(self.page_wallpaper, "wallpaper")
+        self.flow_wallpapers = builder.get_object("flow_wallpapers")
+        self.scroll_wallpapers = builder.get_object("scroll_wallpapers")
+        self.scroll_wallpapers.get_vadjustment().connect("value-changed", self.queue_visible_wallpapers)
+        self.flow_wallpapers.connect("size-allocate", self.queue_visible_wallpapers)
+
+        self.wallpapers_added = True
+        self.add_wallpapers(self.wallpaper_index.load())
+        self.wallpaper_index.watch(self.on_wallpaper_added, self.on_wallpaper_removed)
+
+    def prepare_nightlight_page(self):
+        builder = self.build_page(self.page_nightlight, "nightlight")
+        self.img_nightlight = builder.get_object("img_nightlight")
+        self.ui_night_switch = builder.get_object("ui_night_switch")
+        self.ui_temp_box = builder.get_object("ui_temp_box")
+        self.ui_nightlight_stack = builder.get_object("ui_nightlight_stack")
+        self.ui_temp_low_button = builder.get_object("ui_temp_low_button")
+        self.ui_temp_medium_button = builder.get_object("ui_temp_medium_button")
+        self.ui_temp_high_button = builder.get_object("ui_temp_high_button")
+
+        with profiler.phase("set_initial_nightlight_status"):
+            Artwork.set_image(self.img_nightlight, "pardus-night-light-ss")
+            self.set_initial_nightlight_status()
+        self.ui_temp_box.set_visible(self.config_nightlight_status)
+        # Connected after the saved state is shown, so showing it does not run pardus-night-light
         self.ui_night_switch.connect("state-set", self.on_ui_night_switch_state_set)
+        self.pages.ready(self.page_nightlight)
+
+    def prepare_applications_page(self):
+        builder = self.build_page(self.page_applications, "applications")
+        self.ui_apps_flowbox = builder.get_object("ui_apps_flowbox")
+        self.ui_apps_flowbox.get_style_context().add_class("pardus-software-flowbox")
+        self.ui_apps_error_label = builder.get_object("ui_apps_error_label")
+        self.ui_apps_stack = builder.get_object("ui_apps_stack")
+
+        with profiler.phase("set_pardussoftware_apps"):
+            self.set_pardussoftware_apps()
+
+    def prepare_support_page(self):
+        self.build_page(self.page_support, "support")
+        self.pages.ready(self.page_support)
 
     def set_active_theme(self):
         try:
@@ -336,87 +396,147 @@ class MainWindow:
 
     # Add wallpapers to the grid:
     def add_wallpapers(self, wallpaper_list):
-        for i in range(len(wallpaper_list)):
-            # Image
-            bitmap = GdkPixbuf.Pixbuf.new_from_file(wallpaper_list[i])
-            bitmap = bitmap.scale_simple(240, 135, GdkPixbuf.InterpType.BILINEAR)
+        wallpaper_list = sorted(wallpaper_list)
+        # Tiles are created with a placeholder in sorted order, thumbnails are swapped in as they are decoded
+        for path in wallpaper_list:
+            self.add_wallpaper(path)
+        self.wallpaper_loader.start(wallpaper_list, self.wallpaper_queue.push, self.on_wallpapers_loaded)
+        self.queue_visible_wallpapers()
+
+    def add_wallpaper(self, path, position=-1):
+        img_wallpaper = Gtk.Image.new_from_icon_name("image-x-generic-symbolic", Gtk.IconSize.DIALOG)
+        img_wallpaper.set_size_request(240, 135)
+        img_wallpaper.img_path = path
+
+        tooltip = path
+        try:
+            tooltip = os.path.basename(tooltip)
+            tooltip = os.path.splitext(tooltip)[0]
+            if "pardus23-0_" in tooltip:
+                tooltip = tooltip.split("pardus23-0_")[1]
+                tooltip = tooltip.replace("-", " ")
+            elif "pardus23-" in tooltip and "_" in tooltip:
+                tooltip = tooltip.split("_")[1]
+                tooltip = tooltip.replace("-", " ")
+        except Exception as e:
+            print("{}".format(e))
+            pass
+        img_wallpaper.set_tooltip_text(tooltip)
+
+        # Showing only the new tile keeps each insert O(1), a show_all here traverses the whole grid
+        img_wallpaper.show()
+        self.flow_wallpapers.insert(img_wallpaper, position)
+        self.wallpaper_tiles[path] = img_wallpaper
+
+    def on_wallpaper_added(self, path):
+        if path not in self.wallpaper_tiles:
+            self.add_wallpaper(path, bisect.bisect(sorted(self.wallpaper_tiles), path))
+        self.wallpaper_loader.add([path])
+
+    def on_wallpaper_removed(self, path):
+        self.wallpaper_loader.remove(path)
+        img_wallpaper = self.wallpaper_tiles.pop(path, None)
+        if img_wallpaper is not None:
+            self.flow_wallpapers.remove(img_wallpaper.get_parent())
+
+    def on_wallpapers_loaded(self, wallpaper_list):
+        self.pages.ready(self.page_wallpaper)
+
+    def set_wallpaper_thumbnail(self, path, bitmap):
+        img_wallpaper = self.wallpaper_tiles.get(path)
+        if img_wallpaper is not None:
+            img_wallpaper.set_from_pixbuf(bitmap)
+
+    def queue_visible_wallpapers(self, *args):
+        if self.wallpapers_added and self.visible_wallpapers_source is None:
+            self.visible_wallpapers_source = GLib.idle_add(self.prioritize_visible_wallpapers)
+
+    def prioritize_visible_wallpapers(self):
+        self.visible_wallpapers_source = None
+
+        # Decode the tiles in and one page around the visible area first
+        adjustment = self.scroll_wallpapers.get_vadjustment()
+        top = adjustment.get_value() - adjustment.get_page_size()
+        bottom = adjustment.get_value() + 2 * adjustment.get_page_size()
+
+        visible = []
+        for child in self.flow_wallpapers.get_children():
+            allocation = child.get_allocation()
+            if allocation.y + allocation.height >= top and allocation.y <= bottom:
+                visible.append(child.get_children()[0].img_path)
+        self.wallpaper_loader.prioritize(visible)
+        return False
 
-            img_wallpaper = Gtk.Image.new_from_pixbuf(bitmap)
-            img_wallpaper.img_path = wallpaper_list[i]
+    def get_monitor_resolution(self):
+        display_config_name = "org.cinnamon.Muffin.DisplayConfig"
+        display_config_path = "/org/cinnamon/Muffin/DisplayConfig"
+        if "gnome" in get_current_desktop():
+            display_config_name = "org.gnome.Mutter.DisplayConfig"
+            display_config_path = "/org/gnome/Mutter/DisplayConfig"
 
-            tooltip = wallpaper_list[i]
-            try:
-                tooltip = os.path.basename(tooltip)
-                tooltip = os.path.splitext(tooltip)[0]
-                if "pardus23-0_" in tooltip:
-                    tooltip = tooltip.split("pardus23-0_")[1]
-                    tooltip = tooltip.replace("-", " ")
-                elif "pardus23-" in tooltip and "_" in tooltip:
-                    tooltip = tooltip.split("_")[1]
-                    tooltip = tooltip.replace("-", " ")
-            except Exception as e:
-                print("{}".format(e))
-                pass
-            img_wallpaper.set_tooltip_text(tooltip)
+        self.display_config = DisplayConfig(display_config_name, display_config_path)
+        self.display_config.watch(self.on_display_state_changed)
 
-            GLib.idle_add(self.flow_wallpapers.insert, img_wallpaper, -1)
-            GLib.idle_add(self.flow_wallpapers.show_all)
+    def on_display_state_changed(self, serial, physical_monitors, logical_monitors, properties):
+        self.current_res = ""
+        self.current_scale = ""
+        self.hidpi_found = False
+        self.fullhd_found = False
+        self.hidpi_res = None
+        self.fullhd_res = None
 
-    def get_monitor_resolution(self):
-        self.bus = dbus.SessionBus()
-        self.display_config_name = "org.cinnamon.Muffin.DisplayConfig"
-        self.display_config_path = "/org/cinnamon/Muffin/DisplayConfig"
-        if "gnome" in get_current_desktop():
-            self.display_config_name = "org.gnome.Mutter.DisplayConfig"
-            self.display_config_path = "/org/gnome/Mutter/DisplayConfig"
-
-        display_config_proxy = self.bus.get_object(self.display_config_name, self.display_config_path)
-        display_config_interface = dbus.Interface(display_config_proxy, dbus_interface=self.display_config_name)
-        serial, physical_monitors, logical_monitors, properties = display_config_interface.GetCurrentState()
-        availables = []
-        for x, y, scale, transform, primary, linked_monitors_info, props in logical_monitors:
-            for linked_monitor_connector, linked_monitor_vendor, linked_monitor_product, linked_monitor_serial in linked_monitors_info:
-                for monitor_info, monitor_modes, monitor_properties in physical_monitors:
-                    monitor_connector, monitor_vendor, monitor_product, monitor_serial = monitor_info
-                    if linked_monitor_connector == monitor_connector:
-                        for mode_id, mode_width, mode_height, mode_refresh, mode_preferred_scale, mode_supported_scales, mode_properties in monitor_modes:
-                            availables.append(mode_id)
-                            # print("available: {}".format(mode_id))
-                            if mode_properties.get("is-current", False):
-                                print("current: " + mode_id)
-                                self.current_res = mode_id
-                                self.current_scale = scale
-
-
-        for res in availables:
-            if "3840x2160" in res and not self.hidpi_found:
+        self.monitors = parse_state(physical_monitors, logical_monitors)
+        monitor = get_primary_monitor(self.monitors)
+        if monitor is not None:
+            if monitor.current_mode is not None:
+                print("current: {} {}".format(monitor.connector, monitor.current_mode.id))
+                self.current_res = monitor.current_mode.id
+                self.current_scale = monitor.scale
+
+            hidpi_mode = monitor.best_mode(3840, 2160)
+            if hidpi_mode is not None:
                 self.hidpi_found = True
-                self.hidpi_res = res
-                print("hidpi_found: {}".format(res))
-            if "1920x1080" in res and not self.fullhd_found:
-                self.fullhd_found = True
-                self.fullhd_res = res
-                print("fullhd_found: {}".format(res))
+                self.hidpi_res = hidpi_mode.id
+                print("hidpi_found: {}".format(hidpi_mode.id))
 
-        self.lbl_current_res.set_text("{} (%{})".format(self.current_res, int(self.current_scale * 100)))
+            fullhd_mode = monitor.best_mode(1920, 1080)
+            if fullhd_mode is not None:
+                self.fullhd_found = True
+                self.fullhd_res = fullhd_mode.id
+                print("fullhd_found: {}".format(fullhd_mode.id))
+
+        enabled = [m for m in self.monitors.values() if m.scale is not None and m.current_mode is not None]
+        if len(enabled) > 1:
+            self.lbl_current_res.set_text("\n".join("{}: {} (%{})".format(
+                m.connector, m.current_mode.id, int(m.scale * 100)) for m in sorted(enabled, key=lambda m: m.connector)))
+        elif self.current_res:
+            self.lbl_current_res.set_text("{} (%{})".format(self.current_res, int(self.current_scale * 100)))
+        self.btn_fullhd.set_sensitive(self.fullhd_found)
+        self.btn_4k.set_sensitive(self.hidpi_found)
+        self.pages.ready(self.page_display)
 
     def set_pardussoftware_apps(self):
 
-        self.stream = Stream()
+        self.stream = Stream(self.request)
         self.stream.StreamGet = self.StreamGet
         self.server_response = None
-        self.server = Server()
+        self.apps_tiles = []
+        self.server = Server(self.request)
         self.server.ServerGet = self.ServerGet
         self.server.get(self.apps_url)
 
-    def StreamGet(self, pixbuf, data):
-        lang = f"pretty_{self.user_locale}"
+    def StreamGet(self, pixbuf, suggestion):
+        # Icons of suggestions replaced by a newer server response are dropped
+        for tile_suggestion, icon in self.apps_tiles:
+            if tile_suggestion is suggestion:
+                icon.set_from_pixbuf(pixbuf)
 
-        pretty_name = data[lang]
-        package_name = data["name"]
+    def add_app_tile(self, suggestion):
+        pretty_name = suggestion.pretty_name(self.user_locale)
+        package_name = suggestion.name
 
-        icon = Gtk.Image.new()
-        icon.set_from_pixbuf(pixbuf)
+        # Placeholder until StreamGet swaps in the real icon
+        icon = Gtk.Image.new_from_icon_name("application-x-executable", Gtk.IconSize.DIALOG)
 
         label = Gtk.Label.new()
         label.set_text("{}".format(pretty_name))
@@ -442,36 +562,64 @@ class MainWindow:
         frame.get_style_context().add_class("pardus-software-frame")
         frame.add(listbox)
 
-        self.ui_apps_flowbox.get_style_context().add_class("pardus-software-flowbox")
-        GLib.idle_add(self.ui_apps_flowbox.insert, frame, GLib.PRIORITY_DEFAULT_IDLE)
-
-        GLib.idle_add(self.ui_apps_flowbox.show_all)
+        self.ui_apps_flowbox.insert(frame, -1)
+        self.apps_tiles.append((suggestion, icon))
 
     def ServerGet(self, response):
         if "error" not in response.keys():
+            # The cached response is shown first, only re-render if the server sent something new
+            if response == self.server_response:
+                return
+            self.server_response = response
+            for child in self.ui_apps_flowbox.get_children():
+                self.ui_apps_flowbox.remove(child)
+
             self.ui_apps_stack.set_visible_child_name("apps")
-            datas = response["greeter"]["suggestions"]
-            if len(datas) > 0:
-                for data in datas:
+            self.apps_tiles = []
+            try:
+                # Each suggestion is validated on its own, a malformed one is skipped.
+                # Tiles are created in server order, icons are filled in as they arrive.
+                icons = []
+                for suggestion in parse_suggestions(response):
                     if self.non_tls_tried:
-                        data["icon"] = data["icon"].replace("https", "http")
-                    self.stream.fetch(data)
+                        suggestion = dataclasses.replace(suggestion, icon=suggestion.icon.replace("https", "http"))
+                    self.add_app_tile(suggestion)
+                    self.stream.fetch(suggestion)
+                    icons.append(suggestion.icon)
+                self.stream.prune(icons)
+            except ValueError as e:
+                print("{}".format(e))
+                self.ui_apps_stack.set_visible_child_name("error")
+                self.ui_apps_error_label.set_text("{}".format(e))
+            self.ui_apps_flowbox.show_all()
+            self.pages.ready(self.page_applications)
         else:
             if "tlserror" in response.keys() and not self.non_tls_tried:
                 self.non_tls_tried = True
                 self.apps_url = self.apps_url.replace("https", "http")
                 print("trying {}".format(self.apps_url))
                 self.server.get(self.apps_url)
+            elif response.get("cached", False):
+                # Keep showing the cached suggestions
+                print("{}, showing cached suggestions".format(response["message"]))
             else:
                 error_message = response["message"]
                 print(error_message)
                 self.ui_apps_stack.set_visible_child_name("error")
                 self.ui_apps_error_label.set_text(error_message)
+                self.pages.ready(self.page_applications)
+
+    def on_sound_device_removed(self, device_id):
+        for row in self.sound_listbox.get_children():
+            if row.name.get_id() == device_id:
+                self.sound_listbox.remove(row)
 
-    def on_sound_device_added(self, c, deviceId, direction):
-        device = getattr(self.controller, "lookup_" + direction + "_id")(deviceId)
-        print("Sound Device: {}".format(device.get_description()))
-        self.add_sound_device_to_ui(device)
+    def on_sound_device_auto_selected(self, device):
+        for row in self.sound_listbox.get_children():
+            if row.name is device:
+                self.sound_auto_selecting = True
+                self.sound_listbox.select_row(row)
+                self.sound_auto_selecting = False
 
     def on_sound_default_sink_changed(self, c, deviceId):
         default_sink = self.controller.get_default_sink()
@@ -486,18 +634,17 @@ class MainWindow:
         stream.push_volume()
 
     def add_sound_devices(self):
-        self.controller = Cvc.MixerControl.new("mixer-control")
-        self.controller.open()
+        from SoundDevices import SoundDevices
 
-        self.controller.connect("output-added", self.on_sound_device_added, "output")
-        self.controller.connect("default_sink_changed", self.on_sound_default_sink_changed)
+        self.sound_auto_selecting = False
+        self.sound_devices = SoundDevices(priority=["hdmi"])
+        self.sound_devices.on_added = self.add_sound_device_to_ui
+        self.sound_devices.on_removed = self.on_sound_device_removed
+        self.sound_devices.on_selected = self.on_sound_device_auto_selected
 
-    def select_sound_device(self):
-        time.sleep(3)
-        # If hdmi in list then make it default
-        for row in self.sound_listbox:
-            if "hdmi" in row.name.get_description().lower():
-                GLib.idle_add(self.sound_listbox.select_row, row)
+        self.controller = self.sound_devices.controller
+        self.controller.connect("default_sink_changed", self.on_sound_default_sink_changed)
+        self.sound_devices.open()
 
     def add_sound_device_to_ui(self, device):
         row = Gtk.ListBoxRow()
@@ -521,8 +668,8 @@ class MainWindow:
 
         row.add(box)
         row.name = device
+        row.show_all()
         self.sound_listbox.add(row)
-        GLib.idle_add(self.sound_listbox.show_all)
 
     def set_initial_nightlight_status(self):
         self.config_nightlight_status = False
@@ -560,6 +707,27 @@ class MainWindow:
         else:
             self.ui_nightlight_stack.set_visible_child_name("notinstalled")
 
+    def on_stk_pages_visible_child_changed(self, stack, param):
+        profiler.mark("shown: {}".format(Gtk.Buildable.get_name(stack.get_visible_child())))
+
+        self.pages.approach(stack.get_visible_child())
+
+        # Pre-roll the test sound while the sound page is shown, so Play starts instantly
+        if self.sound_player is None:
+            return
+        if stack.get_visible_child() is self.page_sound:
+            self.sound_player.prepare()
+        else:
+            self.sound_player.unprepare()
+
+    # - profiling
+    def on_first_frame(self, frame_clock):
+        frame_clock.disconnect(self.first_frame_handler)
+        profiler.mark("first-frame")
+
+    def page_interactive(self, page):
+        profiler.mark("interactive: {}".format(Gtk.Buildable.get_name(page)), once=True)
+
     # - stack prev and next page controls
     def get_next_page(self, page):
         increase = 0
@@ -585,6 +753,16 @@ class MainWindow:
 
     # =========== SIGNALS:    
     def onDestroy(self, b):
+        if self.sound_player is not None:
+            self.sound_player.release()
+        self.request.cancel()
+        print("network {}".format(self.request.metrics.summary()))
+        if self.display_config is not None:
+            self.display_config.cancel()
+        WallpaperManager.flush_change_wallpaper()
+        self.wallpaper_index.stop()
+        self.wallpaper_loader.cancel()
+        self.wallpaper_queue.cancel()
         self.window.get_application().quit()
 
     def on_ui_about_button_clicked(self, button):
@@ -593,7 +771,18 @@ class MainWindow:
 
     # - NAVIGATION:
     def on_btn_next_clicked(self, btn):
-        self.stk_pages.set_visible_child_name("{}".format(self.get_next_page(self.currentpage)))
+        self.set_page(self.get_next_page(self.currentpage))
+
+    def show_page(self, name):
+        # Called for the show-page action, see Application.py
+        page = self.builder.get_object("page_{}".format(name))
+        if page is None or page.get_parent() is not self.stk_pages:
+            print("Unknown page: {}".format(name))
+            return
+        self.set_page(int(self.stk_pages.child_get_property(page, "name")))
+
+    def set_page(self, page):
+        self.stk_pages.set_visible_child_name("{}".format(page))
 
         self.currentpage = int(self.stk_pages.get_visible_child_name())
 
@@ -622,7 +811,7 @@ class MainWindow:
     # - Wallpaper Select:
     def on_wallpaper_selected(self, flowbox, wallpaper):
         filename = str(wallpaper.get_children()[0].img_path)
-        WallpaperManager.change_wallpaper(filename)
+        WallpaperManager.queue_change_wallpaper(filename)
 
     def on_ui_apps_flowbox_child_activated(self, flow_box, child):
         package_name = child.get_children()[0].get_children()[0].name
@@ -669,28 +858,31 @@ class MainWindow:
             self.user_settings()
 
     def on_sound_listbox_row_selected(self, listbox, row):
+        if row is None:
+            return
+        if not self.sound_auto_selecting:
+            # The priority policy must not override the user's choice
+            self.sound_devices.user_selected = True
         device = row.name
         print(f"Selected Device: {device.get_description()}")
         GLib.idle_add(self.controller.change_output, device)
 
     def on_play_button_clicked(self, button):
-        Gst.init(None)
-        self.player = Gst.ElementFactory.make('playbin', 'player')
-        self.player.set_property('uri', 'file://' + (os.path.dirname(os.path.abspath(__file__)) + "/../data/sample.m4a"))
-        self.player.set_state(Gst.State.PLAYING)
+        self.sound_player.play()
 
     def on_rb_lightTheme_clicked(self, rb):
         if rb.get_active():
-
-            GLib.idle_add(ThemeManager.set_gtk_theme, "eta")
-            GLib.idle_add(ThemeManager.set_icon_theme, "eta")
-            GLib.idle_add(ThemeManager.set_cinnamon_theme, "eta")
+            try:
+                ThemeManager.set_theme("eta", "eta", "eta")
+            except ValueError as e:
+                print("{}".format(e))
 
     def on_rb_darkTheme_clicked(self, rb):
         if rb.get_active():
-            GLib.idle_add(ThemeManager.set_gtk_theme, "eta-dark")
-            GLib.idle_add(ThemeManager.set_icon_theme, "eta-dark")
-            GLib.idle_add(ThemeManager.set_cinnamon_theme, "eta-dark")
+            try:
+                ThemeManager.set_theme("eta-dark", "eta-dark", "eta-dark")
+            except ValueError as e:
+                print("{}".format(e))
 
     def on_ui_temp_button_clicked(self, button):
         print("on_ui_temp_adjusment_value_changed", self.temp_color[button.get_name()])
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import gi
+
+gi.require_version("GLib", "2.0")
+from gi.repository import GLib
+
+
+class PageManager(object):
+    """Lifecycle of the stk_pages wizard pages.
+
+    A page is registered with an optional prepare() callable that builds the
+    page and starts its data sources. Nothing is prepared up front: approach()
+    prepares the page that is being shown right away and the next prefetch
+    pages from an idle callback, so their work never delays the current page.
+    A page reports that it became interactive with ready(); pages without a
+    prepare() are ready as soon as they are approached. on_ready(widget) is
+    called once per page.
+    """
+
+    def __init__(self, stack, prefetch=1):
+        self.stack = stack
+        self.prefetch = prefetch
+        self.pages = {}
+        self.on_ready = None
+
+    def register(self, widget, prepare=None):
+        self.pages[widget] = {"prepare": prepare, "prepared": False, "ready": False}
+
+    def get_index(self, widget):
+        return int(self.stack.child_get_property(widget, "name"))
+
+    def get_next_pages(self, widget, count):
+        pages = []
+        index = self.get_index(widget)
+        last = max(self.get_index(page) for page in self.pages)
+        while len(pages) < count and index < last:
+            index += 1
+            page = self.stack.get_child_by_name("{}".format(index))
+            if page is not None and page in self.pages:
+                pages.append(page)
+        return pages
+
+    def approach(self, widget):
+        self.prepare(widget)
+        for page in self.get_next_pages(widget, self.prefetch):
+            if not self.pages[page]["prepared"]:
+                GLib.idle_add(self._prefetch, page, priority=GLib.PRIORITY_LOW)
+
+    def prepare(self, widget):
+        page = self.pages.get(widget)
+        if page is None or page["prepared"]:
+            return
+        page["prepared"] = True
+        if page["prepare"] is None:
+            self.ready(widget)
+        else:
+            page["prepare"]()
+
+    def ready(self, widget):
+        page = self.pages.get(widget)
+        if page is None or page["ready"]:
+            return
+        page["ready"] = True
+        if self.on_ready is not None:
+            self.on_ready(widget)
+
+    def _prefetch(self, widget):
+        self.prepare(widget)
+        return False
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Startup instrumentation.
+
+Enabled with the ETA_GREETER_TRACE=<file> environment variable or the
+--trace <file> command line option. Phases and marks are written to <file>
+in Chrome trace-event format when the application quits, so they can be
+opened in chrome://tracing or Perfetto and compared between releases.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Profiler(object):
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.path = os.environ.get("ETA_GREETER_TRACE") or None
+        self.events = []
+        self.marks = set()
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def enable(self, path):
+        self.path = path
+
+    def timestamp(self):
+        # Trace-event timestamps are in microseconds
+        return (time.perf_counter() - self.origin) * 1000000
+
+    def add_event(self, event):
+        event.setdefault("pid", os.getpid())
+        event.setdefault("tid", threading.get_ident())
+        with self.lock:
+            self.events.append(event)
+
+    @contextmanager
+    def phase(self, name, category="startup", **args):
+        if not self.enabled:
+            yield
+            return
+        start = self.timestamp()
+        try:
+            yield
+        finally:
+            self.add_event({"name": name, "cat": category, "ph": "X", "ts": start,
+                            "dur": self.timestamp() - start, "args": args})
+
+    def mark(self, name, category="startup", once=False, **args):
+        if not self.enabled:
+            return
+        if once:
+            with self.lock:
+                if name in self.marks:
+                    return
+                self.marks.add(name)
+        self.add_event({"name": name, "cat": category, "ph": "i", "s": "p", "ts": self.timestamp(), "args": args})
+
+    def save(self, metadata=None):
+        if not self.enabled:
+            return
+        trace = {"traceEvents": self.events, "displayTimeUnit": "ms", "otherData": metadata or {}}
+        try:
+            with open(self.path, "w") as f:
+                json.dump(trace, f, indent=1)
+            print("trace written to {}".format(self.path))
+        except OSError as e:
+            print("Profiler save Error: {}".format(e))
+
+
+profiler = Profiler()
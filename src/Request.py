@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+
+import time
+
+import gi
+
+gi.require_version("GLib", "2.0")
+gi.require_version("Soup", "2.4")
+from gi.repository import GLib, Gio, Soup
+
+
+class RequestMetrics(object):
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.bytes = 0
+        self.latencies = []
+
+    def record(self, latency, size, failed):
+        self.requests += 1
+        self.latencies.append(latency)
+        self.bytes += size
+        if failed:
+            self.failures += 1
+
+    def summary(self):
+        if not self.latencies:
+            return "requests: 0"
+        latencies = sorted(self.latencies)
+        return "requests: {} failures: {} retries: {} bytes: {} latency median: {:.0f} ms max: {:.0f} ms".format(
+            self.requests, self.failures, self.retries, self.bytes,
+            latencies[len(latencies) // 2] * 1000, latencies[-1] * 1000)
+
+
+class Response(object):
+    __slots__ = ("url", "status_code", "headers", "contents", "error_message", "tls_error")
+
+    def __init__(self, url, status_code=0, headers=None, contents=None, error_message=None, tls_error=False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.contents = contents
+        self.error_message = error_message
+        self.tls_error = tls_error
+
+    @property
+    def ok(self):
+        # Redirects are followed by Soup, what is left is e.g. 304 Not Modified for a conditional request
+        return self.error_message is None and 200 <= self.status_code < 400
+
+
+class Request(object):
+    """HTTP GET layer shared by Server and Stream.
+
+    Every request has a deadline of timeout seconds. Network errors, timeouts
+    and 5xx/429 responses are retried up to retries times with exponential
+    backoff (backoff, 2 * backoff, ... capped at max_backoff seconds). TLS
+    errors are not retried. cancel() aborts everything in flight, pending
+    callbacks are not called after that. Latency, size and failures of each
+    request end up in metrics.
+
+    callback(response, *user_data) is called once with a Response.
+    """
+
+    def __init__(self, timeout=10, retries=2, backoff=0.5, max_backoff=8):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.session = Soup.Session(user_agent="eta-cinnamon-greeter")
+        self.cancelled = False
+        self.active = set()
+        self.metrics = RequestMetrics()
+
+    def cancel(self):
+        self.cancelled = True
+        for cancellable in list(self.active):
+            cancellable.cancel()
+
+    def get(self, url, callback, *user_data, headers=None):
+        self._send(url, headers or {}, 0, callback, user_data)
+
+    def _send(self, url, headers, attempt, callback, user_data):
+        if self.cancelled:
+            return
+
+        message = Soup.Message.new("GET", url)
+        if message is None:
+            callback(Response(url, error_message="Invalid URL: {}".format(url)), *user_data)
+            return
+        for name, value in headers.items():
+            message.request_headers.append(name, value)
+
+        state = {"url": url, "headers": headers, "attempt": attempt, "callback": callback, "user_data": user_data,
+                 "message": message, "start": time.monotonic(), "timed_out": False,
+                 "cancellable": Gio.Cancellable()}
+        # The request is cancelled by its own deadline or by cancel()
+        self.active.add(state["cancellable"])
+        state["deadline"] = GLib.timeout_add_seconds(self.timeout, self._on_deadline, state)
+
+        self.session.send_async(message, state["cancellable"], self._on_sent, state)
+
+    def _on_deadline(self, state):
+        state["deadline"] = None
+        state["timed_out"] = True
+        state["cancellable"].cancel()
+        return False
+
+    def _on_sent(self, session, result, state):
+        try:
+            stream = session.send_finish(result)
+        except GLib.Error as error:
+            self._finish(state, None, error)
+            return
+
+        output = Gio.MemoryOutputStream.new_resizable()
+        output.splice_async(stream, Gio.OutputStreamSpliceFlags.CLOSE_SOURCE |
+                            Gio.OutputStreamSpliceFlags.CLOSE_TARGET,
+                            GLib.PRIORITY_DEFAULT, state["cancellable"], self._on_spliced, state)
+
+    def _on_spliced(self, output, result, state):
+        try:
+            output.splice_finish(result)
+        except GLib.Error as error:
+            self._finish(state, None, error)
+            return
+        self._finish(state, output.steal_as_bytes().get_data(), None)
+
+    def _finish(self, state, contents, error):
+        if state["deadline"] is not None:
+            GLib.source_remove(state["deadline"])
+        self.active.discard(state["cancellable"])
+
+        if self.cancelled:
+            return
+
+        message = state["message"]
+        status_code = message.props.status_code
+        response = Response(state["url"], status_code, message.props.response_headers, contents)
+        if error is not None:
+            if state["timed_out"]:
+                response.error_message = "Timed out after {} seconds".format(self.timeout)
+            else:
+                response.error_message = error.message
+            response.tls_error = error.domain == GLib.quark_to_string(Gio.tls_error_quark()) \
+                or status_code == Soup.Status.SSL_FAILED
+        elif not response.ok:
+            response.error_message = message.props.reason_phrase or Soup.Status.get_phrase(status_code)
+
+        latency = time.monotonic() - state["start"]
+        self.metrics.record(latency, len(contents) if contents else 0, response.error_message is not None)
+
+        retryable = (error is not None and not response.tls_error) or status_code >= 500 or status_code == 429
+        if response.error_message is not None and retryable and state["attempt"] < self.retries:
+            delay = min(self.max_backoff, self.backoff * 2 ** state["attempt"])
+            print("{} failed ({}), retrying in {} s".format(state["url"], response.error_message, delay))
+            self.metrics.retries += 1
+            GLib.timeout_add(int(delay * 1000), self._retry, state)
+            return
+
+        state["callback"](response, *state["user_data"])
+
+    def _retry(self, state):
+        if self.cancelled:
+            return False
+        self._send(state["url"], state["headers"], state["attempt"] + 1, state["callback"], state["user_data"])
+        return False
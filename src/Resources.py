@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+import os
+
+import gi
+
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gio, GLib, Gtk
+
+ui_dir = os.path.dirname(os.path.abspath(__file__)) + "/../ui"
+resource_file = ui_dir + "/eta-cinnamon-greeter.gresource"
+resource_prefix = "/tr/org/pardus/eta-cinnamon-greeter/ui"
+
+_registered = None
+
+
+def register_resources():
+    """Registers the compiled UI bundle once.
+
+    Returns False if the bundle has not been built, e.g. when running from
+    the source tree; the .ui files are then read from ui/ directly.
+    """
+    global _registered
+    if _registered is None:
+        try:
+            Gio.resources_register(Gio.Resource.load(resource_file))
+            _registered = True
+        except GLib.Error as e:
+            print("UI resources are not available, loading ui files: {}".format(e.message))
+            _registered = False
+    return _registered
+
+
+def new_builder(name, handler, domain):
+    """Returns a Gtk.Builder for the ui file name (e.g. "pages/sound.ui") with
+    its signals connected to handler."""
+    builder = Gtk.Builder()
+    builder.set_translation_domain(domain)
+    if register_resources():
+        builder.add_from_resource("{}/{}".format(resource_prefix, name))
+    else:
+        builder.add_from_file("{}/{}".format(ui_dir, name))
+    builder.connect_signals(handler)
+    return builder
@@ -4,20 +4,26 @@ import subprocess
 
 import gi
 
-gi.require_version('Xfconf', '0')
-from gi.repository import Xfconf
+defaultDPI = 96
 
-Xfconf.init()
-xsettings = Xfconf.Channel.new("xsettings")
-xfce4_panel = Xfconf.Channel.new("xfce4-panel")
-xfce4_desktop = Xfconf.Channel.new("xfce4-desktop")
+_channels = {}
 
-defaultDPI = 96
+
+def get_channel(name):
+    # Xfconf is loaded and initialised on first use, not when this module is imported
+    if not _channels:
+        gi.require_version('Xfconf', '0')
+        from gi.repository import Xfconf
+
+        Xfconf.init()
+        for channel in ["xsettings", "xfce4-panel", "xfce4-desktop"]:
+            _channels[channel] = Xfconf.Channel.new(channel)
+    return _channels[name]
 
 
 def setScale(scaling_factor):
     newDPI = defaultDPI * scaling_factor
-    xsettings.set_int("/Xft/DPI", int(newDPI))
+    get_channel("xsettings").set_int("/Xft/DPI", int(newDPI))
 
     subprocess.call([
         "xfce4-panel",
@@ -26,40 +32,40 @@ def setScale(scaling_factor):
 
 
 def setPanelSize(px):
-    xfce4_panel.set_uint("/panels/panel-1/size", px)
+    get_channel("xfce4-panel").set_uint("/panels/panel-1/size", px)
 
 
 def setPanelIconSize(px):
-    xfce4_panel.set_uint("/panels/panel-1/icon-size", px)
+    get_channel("xfce4-panel").set_uint("/panels/panel-1/icon-size", px)
 
 
 def setDesktopIconSize(px):
-    xfce4_desktop.set_uint("/desktop-icons/icon-size", px)
+    get_channel("xfce4-desktop").set_uint("/desktop-icons/icon-size", px)
 
 
 def setPointerSize(px):
-    current_theme = xsettings.get_string("/Gtk/CursorThemeName", "Adwaita")
-    xsettings.set_int("/Gtk/CursorThemeSize", px)
-    xsettings.set_string("/Gtk/CursorThemeName", "Adwaita")
-    xsettings.set_string("/Gtk/CursorThemeName", current_theme)
+    current_theme = get_channel("xsettings").get_string("/Gtk/CursorThemeName", "Adwaita")
+    get_channel("xsettings").set_int("/Gtk/CursorThemeSize", px)
+    get_channel("xsettings").set_string("/Gtk/CursorThemeName", "Adwaita")
+    get_channel("xsettings").set_string("/Gtk/CursorThemeName", current_theme)
 
 
 def getScale():
-    dpi = xsettings.get_int("/Xft/DPI", defaultDPI)
+    dpi = get_channel("xsettings").get_int("/Xft/DPI", defaultDPI)
     return float(dpi / defaultDPI)
 
 
 def getPanelSize():
-    return xfce4_panel.get_uint("/panels/panel-1/size", 34)
+    return get_channel("xfce4-panel").get_uint("/panels/panel-1/size", 34)
 
 
 def getPanelIconSize():
-    return xfce4_panel.get_uint("/panels/panel-1/icon-size", 24)
+    return get_channel("xfce4-panel").get_uint("/panels/panel-1/icon-size", 24)
 
 
 def getDesktopIconSize():
-    return xfce4_desktop.get_uint("/desktop-icons/icon-size", 42)
+    return get_channel("xfce4-desktop").get_uint("/desktop-icons/icon-size", 42)
 
 
 def getPointerSize():
-    return xsettings.get_int("/Gtk/CursorThemeSize", 16)
+    return get_channel("xsettings").get_int("/Gtk/CursorThemeSize", 16)
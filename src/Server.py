@@ -8,39 +8,87 @@ Created on Fri Sep 18 14:53:00 2020
 
 import gi
 import json
+import os
 
 gi.require_version("GLib", "2.0")
 gi.require_version("Soup", "2.4")
-from gi.repository import GLib, Gio
+from gi.repository import GLib, Soup
+
+import utils
+from Request import Request
 
 
 class Server(object):
-    def __init__(self):
-        pass
+    """Fetches the greeter suggestions feed.
+
+    The last good response is kept in the user cache directory together with
+    its ETag and Last-Modified headers. get() hands the cached response to
+    ServerGet right away and then revalidates it with a conditional request;
+    ServerGet is only called again if the server sends something new. Error
+    responses carry "cached": True when cached suggestions are already shown.
+    """
+
+    def __init__(self, request=None):
+        self.cachefile = os.path.join(GLib.get_user_cache_dir(), "eta-cinnamon-greeter", "greeter.json")
+        self.request = request if request is not None else Request()
 
     def get(self, url):
-        file = Gio.File.new_for_uri(url)
-        file.load_contents_async(None, self._open_stream)
+        cache = self.read_cache(url)
+        if cache is not None:
+            self.ServerGet(response=cache["response"])  # Send to MainWindow
+
+        headers = {}
+        if cache is not None:
+            if cache.get("etag"):
+                headers["If-None-Match"] = cache["etag"]
+            if cache.get("last_modified"):
+                headers["If-Modified-Since"] = cache["last_modified"]
+        self.request.get(url, self._on_response, cache, headers=headers)
+
+    def _on_response(self, response, cache):
+        if response.status_code == Soup.Status.NOT_MODIFIED and cache is not None:
+            print("{} not modified, using cache".format(response.url))
+            return
+
+        if not response.ok:
+            print("_on_response Error: {}, {}".format(response.status_code, response.error_message))
+            error = {"error": True, "message": response.error_message, "cached": cache is not None}
+            if response.tls_error:
+                error["tlserror"] = True
+            self.ServerGet(response=error)  # Send to MainWindow
+            return
+
+        try:
+            data = json.loads(response.contents)
+            # ServerGet and the cache expect an object, a valid list or string is an error too
+            if not isinstance(data, dict):
+                raise ValueError("response is not a JSON object")
+        except ValueError as e:
+            print("_on_response Error: {}".format(e))
+            self.ServerGet(response={"error": True, "message": "{}".format(e), "cached": cache is not None})
+            return
+
+        self.write_cache(response.url, response.headers, data)
+        if cache is not None and cache["response"] == data:
+            return
+        self.ServerGet(data)  # Send to MainWindow
+
+    def read_cache(self, url):
+        try:
+            with open(self.cachefile) as f:
+                cache = json.load(f)
+            # The feed is the same over http and https, see the TLS fallback in MainWindow
+            if cache["url"].split("://", 1)[-1] == url.split("://", 1)[-1] and isinstance(cache["response"], dict):
+                return cache
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
 
-    def _open_stream(self, file, result):
+    def write_cache(self, url, headers, response):
+        cache = {"url": url, "etag": headers.get_one("ETag"), "last_modified": headers.get_one("Last-Modified"),
+                 "response": response}
         try:
-            success, data, etag = file.load_contents_finish(result)
-        except GLib.Error as error:
-            self.error_message = error.message
-            print("_open_stream Error: {}, {}".format(error.domain, error.message))
-
-            # if error.matches(Gio.tls_error_quark(),  Gio.TlsError.BAD_CERTIFICATE):
-            if error.domain == GLib.quark_to_string(Gio.tls_error_quark()):
-                response = {"error": True, "tlserror": True, "message": error.message}
-                self.ServerGet(response=response)  # Send to MainWindow
-                return response
-
-            response = {"error": True, "message": error.message}
-            self.ServerGet(response=response)  # Send to MainWindow
-            return response
-
-        if success:
-            self.ServerGet(json.loads(data))
-        else:
-            print("ServerGet is not success")
-            self.ServerGet(response=None)  # Send to MainWindow
+            with utils.atomic_write(self.cachefile) as temp_path, open(temp_path, "w") as f:
+                json.dump(cache, f)
+        except OSError as e:
+            print("write_cache Error: {}".format(e))
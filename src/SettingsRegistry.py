@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+
+import gi
+
+gi.require_version("Gio", "2.0")
+from gi.repository import Gio, GLib
+
+# One Gio.Settings object per schema, kept for the lifetime of the process.
+# They are all in delay-apply mode, every write path ends with apply().
+_settings = {}
+
+
+def get_settings(schema):
+    if schema not in _settings:
+        source = Gio.SettingsSchemaSource.get_default()
+        # Gio.Settings.new aborts the process on a missing schema
+        if source is None or source.lookup(schema, True) is None:
+            raise ValueError("GSettings schema {} is not installed".format(schema))
+        settings = Gio.Settings.new(schema)
+        settings.delay()
+        _settings[schema] = settings
+    return _settings[schema]
+
+
+def set_values(schema, values):
+    # All keys are written in a single transaction
+    settings = get_settings(schema)
+    for key, value in values.items():
+        if not isinstance(value, GLib.Variant):
+            value = GLib.Variant(settings.get_value(key).get_type_string(), value)
+        settings.set_value(key, value)
+    settings.apply()
+
+
+def get_value(schema, key):
+    return get_settings(schema).get_value(key)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+import gi
+
+gi.require_version("Cvc", "1.0")
+from gi.repository import Cvc
+
+
+class SoundDevices(object):
+    """Output device model driven by Cvc.MixerControl signals.
+
+    on_added(device) and on_removed(device_id) follow the mixer's output list.
+    Whenever the list changes, the output whose description matches the
+    earliest keyword of priority (e.g. ["hdmi", "usb"]) is reported with
+    on_selected(device). Once the user picks an output (user_selected is set),
+    the policy stops overriding that choice.
+    """
+
+    def __init__(self, priority=("hdmi",)):
+        self.priority = [keyword.lower() for keyword in priority]
+        self.controller = Cvc.MixerControl.new("mixer-control")
+        self.devices = {}
+        self.auto_device = None
+        self.user_selected = False
+
+        self.on_added = None
+        self.on_removed = None
+        self.on_selected = None
+
+    def open(self):
+        self.controller.connect("state-changed", self._on_state_changed)
+        self.controller.connect("output-added", self._on_output_added)
+        self.controller.connect("output-removed", self._on_output_removed)
+        self.controller.open()
+
+    def rank(self, device):
+        description = "{}".format(device.get_description()).lower()
+        for index, keyword in enumerate(self.priority):
+            if keyword in description:
+                return index
+        return len(self.priority)
+
+    def apply_policy(self):
+        if self.user_selected or not self.devices:
+            return
+        device = min(self.devices.values(), key=self.rank)
+        if self.rank(device) == len(self.priority):
+            # No preferred output, keep the system default
+            return
+        if device is not self.auto_device:
+            self.auto_device = device
+            self.on_selected(device)
+
+    def _on_state_changed(self, controller, state):
+        if state == Cvc.MixerControlState.READY:
+            self.apply_policy()
+
+    def _on_output_added(self, controller, device_id):
+        device = controller.lookup_output_id(device_id)
+        if device is None:
+            return
+        print("Sound Device: {}".format(device.get_description()))
+        self.devices[device_id] = device
+        self.on_added(device)
+        self.apply_policy()
+
+    def _on_output_removed(self, controller, device_id):
+        device = self.devices.pop(device_id, None)
+        if device is None:
+            return
+        if device is self.auto_device:
+            self.auto_device = None
+        self.on_removed(device_id)
+        self.apply_policy()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+import gi
+
+gi.require_version("Gst", "1.0")
+from gi.repository import GLib, Gst
+
+
+class SoundPlayer(object):
+    """Single reusable playbin for the sound test.
+
+    The pipeline is created the first time prepare() is called and pre-rolled
+    to PAUSED, so play() only has to seek to the start and set PLAYING. At
+    end of stream, on errors and on release() it goes to NULL, which frees
+    the decoders and the audio device; the same pipeline is used again by
+    the next prepare() or play().
+    """
+
+    def __init__(self, path):
+        self.uri = GLib.filename_to_uri(path, None)
+        self.player = None
+        self.prerolled = False
+        self.playing = False
+
+    def create(self):
+        Gst.init(None)
+        self.player = Gst.ElementFactory.make("playbin", "player")
+        self.player.set_property("uri", self.uri)
+
+        bus = self.player.get_bus()
+        bus.add_signal_watch()
+        bus.connect("message::eos", self._on_eos)
+        bus.connect("message::error", self._on_error)
+
+    def prepare(self):
+        if self.player is None:
+            self.create()
+        if not self.prerolled:
+            self.player.set_state(Gst.State.PAUSED)
+            self.prerolled = True
+
+    def play(self):
+        self.prepare()
+        self.player.seek_simple(Gst.Format.TIME, Gst.SeekFlags.FLUSH | Gst.SeekFlags.KEY_UNIT, 0)
+        self.player.set_state(Gst.State.PLAYING)
+        self.playing = True
+
+    def unprepare(self):
+        # Drop the pre-rolled pipeline, but let a playing sound finish
+        if not self.playing:
+            self.release()
+
+    def release(self):
+        if self.player is not None and self.prerolled:
+            self.player.set_state(Gst.State.NULL)
+            self.prerolled = False
+            self.playing = False
+
+    def _on_eos(self, bus, message):
+        self.release()
+
+    def _on_error(self, bus, message):
+        error, debug = message.parse_error()
+        print("SoundPlayer Error: {}, {}".format(error.message, debug))
+        self.release()
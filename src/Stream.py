@@ -1,39 +1,151 @@
+import hashlib
+import os
+from collections import OrderedDict, deque
+
 import gi
 
 gi.require_version("GLib", "2.0")
 gi.require_version("GdkPixbuf", "2.0")
 from gi.repository import GLib, GdkPixbuf, Gio
 
+import utils
+from Request import Request
+
 
 class Stream(object):
-    def __init__(self):
-        pass
+    """Fetches suggestion icons.
+
+    Downloaded icons are stored in the user cache directory under the sha256
+    of their URL, so repeated launches read them from disk and make no network
+    requests. prune() removes the icons of suggestions that are gone from the
+    feed. Decoded pixbufs are kept in an in-memory LRU. At most
+    max_downloads downloads run at the same time and requests for a URL that
+    is already being fetched wait for that fetch instead of starting another.
+    """
+
+    def __init__(self, request=None, max_downloads=4, icon_size=None, memory_size=64):
+        self.request = request if request is not None else Request()
+        self.max_downloads = max_downloads
+        self.icon_size = icon_size
+        self.memory_size = memory_size
+        self.cachedir = os.path.join(GLib.get_user_cache_dir(), "eta-cinnamon-greeter", "icons")
+
+        self.memory = OrderedDict()
+        self.waiting = {}
+        self.download_queue = deque()
+        self.downloads = 0
+
+    def get_cache_path(self, url):
+        return os.path.join(self.cachedir, hashlib.sha256(url.encode("utf-8")).hexdigest())
 
-    def fetch(self, data):
-        img_file = Gio.File.new_for_uri(data["icon"])
-        img_file.read_async(GLib.PRIORITY_LOW, None, self._open_stream, data)
+    def fetch(self, suggestion):
+        url = suggestion.icon
 
-    def _open_stream(self, img_file, result, data):
+        pixbuf = self.memory.get(url)
+        if pixbuf is not None:
+            self.memory.move_to_end(url)
+            self.StreamGet(pixbuf, suggestion)
+            return
+
+        # Coalesce requests for an icon that is already being fetched
+        if url in self.waiting:
+            self.waiting[url].append(suggestion)
+            return
+        self.waiting[url] = [suggestion]
+
+        cache_path = self.get_cache_path(url)
+        if os.path.isfile(cache_path):
+            Gio.File.new_for_path(cache_path).load_contents_async(None, self._on_cache_loaded, url)
+        else:
+            self.download_queue.append(url)
+            self._start_downloads()
+
+    def _start_downloads(self):
+        while self.download_queue and self.downloads < self.max_downloads:
+            url = self.download_queue.popleft()
+            self.downloads += 1
+            self.request.get(url, self._on_downloaded, url)
+
+    def _on_cache_loaded(self, file, result, url):
         try:
-            stream = img_file.read_finish(result)
+            success, contents, etag = file.load_contents_finish(result)
+            pixbuf = self.decode(contents)
         except GLib.Error as error:
-            print("_open_stream Error: {}, {}".format(error.domain, error.message))
-            return False
+            # Broken cache file, download the icon again
+            print("_on_cache_loaded Error: {}, {}, {}".format(url, error.domain, error.message))
+            self._remove_cache(url)
+            self.download_queue.append(url)
+            self._start_downloads()
+            return
+
+        self._deliver(url, pixbuf)
 
-        GdkPixbuf.Pixbuf.new_from_stream_async(stream, None, self._pixbuf_loaded, data)
+    def _on_downloaded(self, response, url):
+        self.downloads -= 1
+        self._start_downloads()
+
+        if not response.ok:
+            print("_on_downloaded Error: {}, {}".format(url, response.error_message))
+            self.waiting.pop(url, None)
+            return
 
-    def _pixbuf_loaded(self, stream, result, data):
         try:
-            pixbuf = GdkPixbuf.Pixbuf.new_from_stream_finish(result)
+            pixbuf = self.decode(response.contents)
         except GLib.Error as error:
-            print("_pixbuf_loaded Error: {}, {}".format(error.domain, error.message))
-            return False
+            print("_on_downloaded Error: {}, {}, {}".format(url, error.domain, error.message))
+            self.waiting.pop(url, None)
+            return
+
+        self._write_cache(url, response.contents)
+        self._deliver(url, pixbuf)
+
+    def _deliver(self, url, pixbuf):
+        self.memory[url] = pixbuf
+        if len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
 
-        stream.close_async(GLib.PRIORITY_LOW, None, self._close_stream, None)
-        self.StreamGet(pixbuf, data)
+        for suggestion in self.waiting.pop(url, []):
+            self.StreamGet(pixbuf, suggestion)
 
-    def _close_stream(self, stream, result, data):
+    def decode(self, contents):
+        loader = GdkPixbuf.PixbufLoader()
+        if self.icon_size is not None:
+            loader.connect("size-prepared", self._on_size_prepared)
         try:
-            stream.close_finish(result)
-        except GLib.Error as error:
-            print("Error: {}, {}".format(error.domain, error.message))
+            loader.write(contents)
+        finally:
+            loader.close()
+        return loader.get_pixbuf()
+
+    def _on_size_prepared(self, loader, width, height):
+        # Decode at display size, keeping the aspect ratio
+        scale = min(self.icon_size / width, self.icon_size / height)
+        if scale < 1:
+            loader.set_size(max(1, int(width * scale)), max(1, int(height * scale)))
+
+    def _write_cache(self, url, contents):
+        try:
+            with utils.atomic_write(self.get_cache_path(url)) as temp_path, open(temp_path, "wb") as f:
+                f.write(contents)
+        except OSError as e:
+            print("_write_cache Error: {}".format(e))
+
+    def prune(self, urls):
+        # Remove icons of suggestions the feed does not list any more
+        keep = {os.path.basename(self.get_cache_path(url)) for url in urls}
+        try:
+            cache_files = os.listdir(self.cachedir)
+        except OSError:
+            return
+        for cache_file in cache_files:
+            if cache_file not in keep:
+                try:
+                    os.remove(os.path.join(self.cachedir, cache_file))
+                except OSError as e:
+                    print("{}".format(e))
+
+    def _remove_cache(self, url):
+        try:
+            os.remove(self.get_cache_path(url))
+        except OSError:
+            pass
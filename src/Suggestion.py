@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    """A validated application suggestion of the greeter feed."""
+
+    __slots__ = ("name", "icon", "pretty_names")
+
+    name: str
+    icon: str
+    # {"tr": "...", "en": "..."} from the pretty_<locale> keys
+    pretty_names: dict
+
+    def pretty_name(self, locale):
+        return self.pretty_names.get(locale) or self.pretty_names.get("en") or self.name
+
+    @classmethod
+    def from_json(cls, data):
+        if not isinstance(data, dict):
+            raise ValueError("suggestion is not an object: {!r}".format(data))
+
+        name = data.get("name")
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("suggestion has no name: {!r}".format(data))
+
+        icon = data.get("icon")
+        if not isinstance(icon, str) or not icon.startswith(("https://", "http://")):
+            raise ValueError("suggestion {} has no icon url".format(name))
+
+        pretty_names = {}
+        for key, value in data.items():
+            if key.startswith("pretty_") and isinstance(value, str) and value.strip():
+                pretty_names[key[len("pretty_"):]] = value.strip()
+
+        return cls(name.strip(), icon, pretty_names)
+
+
+def parse_suggestions(response):
+    """Yields a Suggestion for each valid item of a greeter response.
+
+    ValueError is raised if the response has no suggestion list at all; a
+    malformed item is reported and skipped, the rest are still yielded.
+    """
+    try:
+        items = response["greeter"]["suggestions"]
+    except (KeyError, TypeError):
+        raise ValueError("response has no greeter suggestions")
+    if not isinstance(items, list):
+        raise ValueError("greeter suggestions is not a list")
+
+    for item in items:
+        try:
+            yield Suggestion.from_json(item)
+        except ValueError as e:
+            print("Skipping suggestion: {}".format(e))
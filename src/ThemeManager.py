@@ -1,60 +1,48 @@
 #!/usr/bin/env python3
 
-import subprocess
+from SettingsRegistry import get_settings
+
+interface_schema = "org.cinnamon.desktop.interface"
+theme_schema = "org.cinnamon.theme"
+
+
+def set_theme(gtk_theme, icon_theme, cinnamon_theme):
+    interface = get_settings(interface_schema)
+    cinnamon = get_settings(theme_schema)
+
+    interface.set_string("gtk-theme", gtk_theme)
+    interface.set_string("icon-theme", icon_theme)
+    cinnamon.set_string("name", cinnamon_theme)
+
+    interface.apply()
+    cinnamon.apply()
 
 
 def set_gtk_theme(theme):
-    subprocess.call([
-        "gsettings",
-        "set",
-        "org.cinnamon.desktop.interface",
-        "gtk-theme",
-        f"'{theme}'"
-    ])
+    settings = get_settings(interface_schema)
+    settings.set_string("gtk-theme", theme)
+    settings.apply()
 
 
 def set_icon_theme(theme):
-    subprocess.call([
-        "gsettings",
-        "set",
-        "org.cinnamon.desktop.interface",
-        "icon-theme",
-        f"'{theme}'"
-    ])
+    settings = get_settings(interface_schema)
+    settings.set_string("icon-theme", theme)
+    settings.apply()
 
 
 def set_cinnamon_theme(theme):
-    subprocess.call([
-        "gsettings",
-        "set",
-        "org.cinnamon.theme",
-        "name",
-        f"'{theme}'"
-    ])
+    settings = get_settings(theme_schema)
+    settings.set_string("name", theme)
+    settings.apply()
 
 
 def get_gtk_theme():
-    return subprocess.check_output([
-        "gsettings",
-        "get",
-        "org.cinnamon.desktop.interface",
-        "gtk-theme"
-    ]).decode("utf-8").rstrip()
-
-
-def get_icon_theme(theme):
-    return subprocess.check_output([
-        "gsettings",
-        "get",
-        "org.cinnamon.desktop.interface",
-        "icon-theme"
-    ]).decode("utf-8").rstrip()
-
-
-def get_cinnamon_theme(theme):
-    return subprocess.check_output([
-        "gsettings",
-        "get",
-        "org.cinnamon.theme",
-        "name"
-    ]).decode("utf-8").rstrip()
+    return get_settings(interface_schema).get_string("gtk-theme")
+
+
+def get_icon_theme():
+    return get_settings(interface_schema).get_string("icon-theme")
+
+
+def get_cinnamon_theme():
+    return get_settings(theme_schema).get_string("name")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+import hashlib
+import os
+
+import gi
+
+gi.require_version("GLib", "2.0")
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import GLib, GdkPixbuf
+
+import utils
+
+
+class ThumbnailCache(object):
+    """Greeter-private wallpaper thumbnail cache.
+
+    Thumbnails are stored as PNG files named after the md5 of the image URI
+    (like the freedesktop thumbnail spec) and carry the source mtime and size
+    in their tEXt chunks. An entry whose mtime or size does not match the
+    source file any more is stale and gets regenerated.
+
+    With decode_at_size the loader is told the target size before decoding,
+    so loaders that support it (JPEG DCT scaling) never materialize the full
+    resolution image. Without it the image is decoded at native resolution
+    and scaled afterwards.
+    """
+
+    def __init__(self, width=240, height=135, decode_at_size=True):
+        self.width = width
+        self.height = height
+        self.decode_at_size = decode_at_size
+        self.cachedir = os.path.join(GLib.get_user_cache_dir(), "eta-cinnamon-greeter", "thumbnails",
+                                     "{}x{}".format(width, height))
+
+    def get_cache_path(self, path):
+        uri = GLib.filename_to_uri(path, None)
+        return os.path.join(self.cachedir, hashlib.md5(uri.encode("utf-8")).hexdigest() + ".png")
+
+    def lookup(self, path, stat=None):
+        try:
+            if stat is None:
+                stat = os.stat(path)
+        except OSError as e:
+            print("{}".format(e))
+            return None
+
+        cache_path = self.get_cache_path(path)
+        if not os.path.isfile(cache_path):
+            return None
+
+        try:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file(cache_path)
+        except GLib.Error as error:
+            print("ThumbnailCache lookup Error: {}, {}".format(error.domain, error.message))
+            return None
+
+        if pixbuf.get_option("tEXt::Thumb::URI") != GLib.filename_to_uri(path, None) \
+                or pixbuf.get_option("tEXt::Thumb::MTime") != str(int(stat.st_mtime)) \
+                or pixbuf.get_option("tEXt::Thumb::Size") != str(stat.st_size) \
+                or pixbuf.get_width() != self.width or pixbuf.get_height() != self.height:
+            return None
+
+        return pixbuf
+
+    def store(self, path, pixbuf, stat=None):
+        if stat is None:
+            stat = os.stat(path)
+
+        with utils.atomic_write(self.get_cache_path(path)) as temp_path:
+            pixbuf.savev(temp_path, "png",
+                         ["tEXt::Thumb::URI", "tEXt::Thumb::MTime", "tEXt::Thumb::Size"],
+                         [GLib.filename_to_uri(path, None), str(int(stat.st_mtime)), str(stat.st_size)])
+
+    def create(self, path):
+        if self.decode_at_size:
+            return GdkPixbuf.Pixbuf.new_from_file_at_scale(path, self.width, self.height, False)
+
+        bitmap = GdkPixbuf.Pixbuf.new_from_file(path)
+        return bitmap.scale_simple(self.width, self.height, GdkPixbuf.InterpType.BILINEAR)
+
+    def get(self, path):
+        stat = os.stat(path)
+
+        pixbuf = self.lookup(path, stat)
+        if pixbuf is not None:
+            return pixbuf
+
+        pixbuf = self.create(path)
+        try:
+            self.store(path, pixbuf, stat)
+        except (GLib.Error, OSError) as e:
+            print("ThumbnailCache store Error: {}".format(e))
+        return pixbuf
+
+    def prune(self, paths):
+        # Remove thumbnails of wallpapers that do not exist any more
+        keep = {os.path.basename(self.get_cache_path(path)) for path in paths}
+        try:
+            cache_files = os.listdir(self.cachedir)
+        except OSError:
+            return
+        for cache_file in cache_files:
+            if cache_file not in keep:
+                try:
+                    os.remove(os.path.join(self.cachedir, cache_file))
+                except OSError as e:
+                    print("{}".format(e))
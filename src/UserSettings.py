@@ -21,7 +21,10 @@ class UserSettings(object):
         self.configfile = "settings.ini"
 
         self.autostartdir = self.userhome + "/.config/autostart/"
-        self.autostartfile = "tr.org.pardus.eta-cinnamon-greeter.desktop"
+        # Not D-Bus activatable, so the session starts the greeter with --autostart
+        self.autostartfile = "tr.org.pardus.eta-cinnamon-greeter-autostart.desktop"
+        # Earlier versions linked the application's own desktop file
+        self.legacy_autostartfile = "tr.org.pardus.eta-cinnamon-greeter.desktop"
 
         self.config = ConfigParser(strict=False)
 
@@ -77,3 +80,12 @@ class UserSettings(object):
         else:
             if p.exists():
                 p.unlink(missing_ok=True)
+
+    def remove_autostart(self):
+        # The autostart entry from /etc/skel greets the user only on the first boot,
+        # set_autostart adds it back if the user settings ask for it
+        for autostartfile in (self.autostartfile, self.legacy_autostartfile):
+            try:
+                Path(self.autostartdir + autostartfile).unlink(missing_ok=True)
+            except OSError as e:
+                print("remove_autostart : {}".format(e))
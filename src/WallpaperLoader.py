@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import gi
+
+gi.require_version("GLib", "2.0")
+from gi.repository import GLib
+
+
+def get_worker_count():
+    try:
+        workers = int(os.environ.get("ETA_GREETER_THUMBNAIL_WORKERS", ""))
+    except ValueError:
+        workers = min(4, os.cpu_count() or 1)
+    return max(1, workers)
+
+
+class WallpaperLoader(object):
+    """Generates wallpaper thumbnails on a bounded thread pool.
+
+    At most one job per worker is in flight; the next path is taken from the
+    pending list when a job finishes, so prioritize() can move the tiles the
+    user is looking at to the front at any time. on_loaded is called from a
+    worker thread, so it has to be thread safe (IdleQueue.push is). cancel()
+    stops pending work, e.g. when the window is closed.
+    """
+
+    def __init__(self, thumbnail_cache, workers=None):
+        self.thumbnail_cache = thumbnail_cache
+        self.workers = workers if workers else get_worker_count()
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+        self.executor = None
+
+        self.paths = []
+        self.pending = []
+        self.in_flight = 0
+        self.on_loaded = None
+        self.on_finished = None
+
+    def start(self, paths, on_loaded, on_finished=None):
+        self.on_loaded = on_loaded
+        self.on_finished = on_finished
+        self.add(paths)
+
+    def add(self, paths):
+        with self.lock:
+            self.paths.extend(path for path in paths if path not in self.paths)
+            self.pending.extend(path for path in paths if path not in self.pending)
+        while self._submit_next():
+            pass
+
+    def remove(self, path):
+        with self.lock:
+            if path in self.paths:
+                self.paths.remove(path)
+            if path in self.pending:
+                self.pending.remove(path)
+
+    def prioritize(self, paths):
+        with self.lock:
+            pending = set(self.pending)
+            first = [path for path in paths if path in pending]
+            if not first:
+                return
+            first_set = set(first)
+            self.pending = first + [path for path in self.pending if path not in first_set]
+
+    def cancel(self):
+        self.cancelled.set()
+        with self.lock:
+            self.pending.clear()
+            executor = self.executor
+            self.executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit_next(self):
+        with self.lock:
+            if self.cancelled.is_set() or not self.pending or self.in_flight >= self.workers:
+                return False
+            path = self.pending.pop(0)
+            self.in_flight += 1
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="wallpaper-loader")
+            executor = self.executor
+        try:
+            future = executor.submit(self._load, path)
+        except RuntimeError:
+            # Executor was shut down by cancel()
+            return False
+        future.add_done_callback(lambda f: self._done(path, f))
+        return True
+
+    def _load(self, path):
+        if self.cancelled.is_set():
+            return None
+        try:
+            return self.thumbnail_cache.get(path)
+        except (GLib.Error, OSError) as e:
+            print("WallpaperLoader Error: {}: {}".format(path, e))
+            return None
+
+    def _done(self, path, future):
+        if future.cancelled() or self.cancelled.is_set():
+            return
+
+        pixbuf = future.result()
+        if pixbuf is not None:
+            self.on_loaded(path, pixbuf)
+
+        with self.lock:
+            self.in_flight -= 1
+            all_finished = self.in_flight == 0 and not self.pending
+            if all_finished:
+                executor = self.executor
+                self.executor = None
+            paths = list(self.paths)
+
+        if not all_finished:
+            self._submit_next()
+            return
+
+        executor.shutdown(wait=False)
+        self.thumbnail_cache.prune(paths)
+        if self.on_finished is not None:
+            GLib.idle_add(self._emit, self.on_finished, paths)
+
+    def _emit(self, callback, *args):
+        if not self.cancelled.is_set():
+            callback(*args)
+        return False
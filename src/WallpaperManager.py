@@ -1,11 +1,18 @@
 #!/usr/bin/env python3
 
+import json
 import os
 
 import gi
 
-gi.require_version("Gtk", "3.0")
-from gi.repository import Gio, GLib
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import Gio, GLib, GdkPixbuf
+
+import SettingsRegistry
+import utils
+
+wallpaper_dir = "/usr/share/backgrounds"
+background_schema = "org.cinnamon.desktop.background"
 
 
 def val_to_variant(val):
@@ -20,31 +27,176 @@ def val_to_variant(val):
 
 
 def gsettings_set(schema, key, value):
-    gio_val = val_to_variant(value)
-    settings = Gio.Settings.new(schema)
-    return settings.set_value(key, gio_val)
+    settings = SettingsRegistry.get_settings(schema)
+    result = settings.set_value(key, val_to_variant(value))
+    settings.apply()
+    return result
 
 
 def gsettings_get(schema, key):
-    settings = Gio.Settings.new(schema)
-    return settings.get_value(key)
+    return SettingsRegistry.get_value(schema, key)
 
 
-def change_wallpaper(picture_uri):
-    theme_schema = "org.cinnamon.desktop.background"
-    theme_keys = ["picture-uri"]
-    for theme in theme_keys:
-        gsettings_set(theme_schema, theme, "file://" + picture_uri)
+def change_wallpaper(picture_uri, picture_options=None):
+    values = {"picture-uri": GLib.filename_to_uri(picture_uri, None)}
+    if picture_options is not None:
+        values["picture-options"] = picture_options
+    SettingsRegistry.set_values(background_schema, values)
     return True
 
 
-def get_wallpapers():
-    wallpaper_dir = "/usr/share/backgrounds"
-    wallpapers = []
-    for root, dirs, files in os.walk(wallpaper_dir):
-        dirs.clear()
-        for file_name in files:
-            path = os.path.join(root, file_name)
-            wallpapers.append(path)
-    return wallpapers
+# Selections arriving faster than this are coalesced, only the last one is committed
+change_wallpaper_delay = 250
+_pending_wallpaper = None
+_pending_wallpaper_source = None
+
+
+def queue_change_wallpaper(picture_uri, picture_options=None):
+    global _pending_wallpaper, _pending_wallpaper_source
+    _pending_wallpaper = (picture_uri, picture_options)
+    if _pending_wallpaper_source is not None:
+        GLib.source_remove(_pending_wallpaper_source)
+    _pending_wallpaper_source = GLib.timeout_add(change_wallpaper_delay, flush_change_wallpaper)
+
+
+def flush_change_wallpaper():
+    global _pending_wallpaper, _pending_wallpaper_source
+    if _pending_wallpaper_source is not None:
+        GLib.source_remove(_pending_wallpaper_source)
+        _pending_wallpaper_source = None
+    if _pending_wallpaper is not None:
+        picture_uri, picture_options = _pending_wallpaper
+        _pending_wallpaper = None
+        try:
+            change_wallpaper(picture_uri, picture_options)
+        except ValueError as e:
+            print("{}".format(e))
+    return GLib.SOURCE_REMOVE
+
+
+def get_image_extensions():
+    extensions = set()
+    for pixbuf_format in GdkPixbuf.Pixbuf.get_formats():
+        extensions.update(".{}".format(extension.lower()) for extension in pixbuf_format.get_extensions())
+    return tuple(extensions)
+
+
+def get_image_mime_types():
+    mime_types = set()
+    for pixbuf_format in GdkPixbuf.Pixbuf.get_formats():
+        mime_types.update(pixbuf_format.get_mime_types())
+    return mime_types
+
+
+class WallpaperIndex(object):
+    """Sorted list of the images in the wallpaper directory.
+
+    Only files GdkPixbuf has a loader for are listed, so slideshow XML files,
+    licenses etc. never reach the thumbnailer. The list is persisted and only
+    rescanned when the directory mtime changes; watch() keeps it current with
+    a Gio.FileMonitor and reports single additions and removals.
+    """
+
+    def __init__(self, directory=wallpaper_dir):
+        self.directory = directory
+        self.indexfile = os.path.join(GLib.get_user_cache_dir(), "eta-cinnamon-greeter", "wallpapers.json")
+        self.extensions = get_image_extensions()
+        self.mime_types = get_image_mime_types()
 
+        self.wallpapers = []
+        self.monitor = None
+        self.on_added = None
+        self.on_removed = None
+
+    def is_wallpaper(self, path):
+        if not os.path.isfile(path):
+            return False
+        if path.lower().endswith(self.extensions):
+            return True
+        content_type, uncertain = Gio.content_type_guess(path, None)
+        mime_type = Gio.content_type_get_mime_type(content_type)
+        return mime_type in self.mime_types
+
+    def get_directory_mtime(self):
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self):
+        mtime = self.get_directory_mtime()
+        try:
+            with open(self.indexfile) as f:
+                index = json.load(f)
+            if index["directory"] == self.directory and index["mtime"] == mtime:
+                self.wallpapers = index["wallpapers"]
+                return list(self.wallpapers)
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        self.scan()
+        self.save()
+        return list(self.wallpapers)
+
+    def scan(self):
+        wallpapers = []
+        for root, dirs, files in os.walk(self.directory):
+            dirs.clear()
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                if self.is_wallpaper(path):
+                    wallpapers.append(path)
+        self.wallpapers = sorted(wallpapers)
+
+    def save(self):
+        index = {"directory": self.directory, "mtime": self.get_directory_mtime(), "wallpapers": self.wallpapers}
+        try:
+            with utils.atomic_write(self.indexfile) as temp_path, open(temp_path, "w") as f:
+                json.dump(index, f)
+        except OSError as e:
+            print("WallpaperIndex save Error: {}".format(e))
+
+    def watch(self, on_added, on_removed):
+        self.on_added = on_added
+        self.on_removed = on_removed
+        try:
+            directory = Gio.File.new_for_path(self.directory)
+            self.monitor = directory.monitor_directory(Gio.FileMonitorFlags.WATCH_MOVES, None)
+            self.monitor.connect("changed", self._on_directory_changed)
+        except GLib.Error as error:
+            print("WallpaperIndex watch Error: {}, {}".format(error.domain, error.message))
+
+    def stop(self):
+        if self.monitor is not None:
+            self.monitor.cancel()
+            self.monitor = None
+
+    def _add(self, path):
+        if not self.is_wallpaper(path):
+            return
+        if path not in self.wallpapers:
+            self.wallpapers.append(path)
+            self.wallpapers.sort()
+        self.save()
+        # Also called for existing files, so their thumbnails get refreshed
+        self.on_added(path)
+
+    def _remove(self, path):
+        if path in self.wallpapers:
+            self.wallpapers.remove(path)
+            self.save()
+            self.on_removed(path)
+
+    def _on_directory_changed(self, monitor, file, other_file, event_type):
+        # Created files may still be written, wait for CHANGES_DONE_HINT before adding them
+        if event_type in (Gio.FileMonitorEvent.CHANGES_DONE_HINT, Gio.FileMonitorEvent.MOVED_IN):
+            self._add(file.get_path())
+        elif event_type in (Gio.FileMonitorEvent.DELETED, Gio.FileMonitorEvent.MOVED_OUT):
+            self._remove(file.get_path())
+        elif event_type == Gio.FileMonitorEvent.RENAMED:
+            self._remove(file.get_path())
+            self._add(other_file.get_path())
+
+
+def get_wallpapers():
+    return WallpaperIndex(wallpaper_dir).load()
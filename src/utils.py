@@ -1,11 +1,9 @@
 #!/usr/bin/env python3
 
-import os
-
-import gi
+# Used before GI is loaded (see Main.should_greet), keep this module to the standard library
 
-gi.require_version('Gtk', '3.0')
-from gi.repository import Gtk
+import os
+from contextlib import contextmanager
 
 
 def getenv(name):
@@ -16,25 +14,26 @@ def getenv(name):
 
 
 def check_live():
-    f = open("/proc/cmdline", "r").read()
-    return "boot=live" in f
-
-
-class Dialog(Gtk.MessageDialog):
-    def __init__(self, style, buttons, title, text, text2=None, parent=None):
-        Gtk.MessageDialog.__init__(self, parent, 0, style, buttons)
-        self.set_position(Gtk.WindowPosition.CENTER)
-        self.set_title(title)
-        self.set_markup(text)
-
-    def show(self):
+    try:
+        with open("/proc/cmdline", "r") as f:
+            return "boot=live" in f.read()
+    except OSError:
+        return False
+
+
+@contextmanager
+def atomic_write(path):
+    """Yields a temporary path next to path to write to. When the block ends
+    it replaces path, so a crash never leaves a truncated file behind. On an
+    error the temporary file is removed and path is left as it was."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = "{}.{}.tmp".format(path, os.getpid())
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
         try:
-            response = self.run()
-        finally:
-            self.destroy()
-
-
-def ErrorDialog(*args):
-    dialog = Dialog(Gtk.MessageType.ERROR, Gtk.ButtonsType.NONE, *args)
-    dialog.add_button("OK", Gtk.ResponseType.OK)
-    return dialog.show()
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
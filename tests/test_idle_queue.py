@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from gi.repository import GLib
+
+from IdleQueue import IdleQueue
+
+
+class IdleQueueTest(unittest.TestCase):
+    def run_queue(self, count, handler_delay=0, budget=0.008, from_thread=False):
+        loop = GLib.MainLoop()
+        handled = []
+
+        def handler(index):
+            if handler_delay:
+                time.sleep(handler_delay)
+            handled.append(index)
+
+        queue = IdleQueue(handler, on_drained=loop.quit, budget=budget)
+
+        def push():
+            for index in range(count):
+                queue.push(index)
+
+        if from_thread:
+            thread = threading.Thread(target=push)
+            thread.start()
+            thread.join()
+        else:
+            push()
+
+        GLib.timeout_add_seconds(10, loop.quit)
+        loop.run()
+        return queue, handled
+
+    def test_batches_items_into_few_dispatches(self):
+        queue, handled = self.run_queue(1000)
+        self.assertEqual(handled, list(range(1000)))
+        self.assertLessEqual(queue.dispatches, 10)
+
+    def test_yields_to_the_main_loop_when_budget_is_spent(self):
+        # About five items fit in one dispatch
+        queue, handled = self.run_queue(50, handler_delay=0.001, budget=0.005)
+        self.assertEqual(handled, list(range(50)))
+        self.assertGreater(queue.dispatches, 1)
+        self.assertLess(queue.dispatches, 50)
+
+    def test_items_pushed_from_a_thread(self):
+        queue, handled = self.run_queue(500, from_thread=True)
+        self.assertEqual(handled, list(range(500)))
+        self.assertLessEqual(queue.dispatches, 10)
+
+    def test_cancel_drops_pending_items(self):
+        handled = []
+        queue = IdleQueue(handled.append)
+        for index in range(10):
+            queue.push(index)
+        queue.cancel()
+
+        context = GLib.MainContext.default()
+        while context.pending():
+            context.iteration(False)
+        self.assertEqual(handled, [])
+        self.assertEqual(queue.dispatches, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
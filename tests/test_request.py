@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+import http.server
+import os
+import socketserver
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import gi
+
+try:
+    gi.require_version("Soup", "2.4")
+except ValueError:
+    raise unittest.SkipTest("Soup 2.4 is not available")
+
+from gi.repository import GLib
+
+from Request import Request
+
+
+def setUpModule():
+    # Soup's default proxy resolver reads these, the stand-ins are local
+    for name in ["http_proxy", "https_proxy", "HTTP_PROXY", "HTTPS_PROXY"]:
+        os.environ.pop(name, None)
+
+
+class StandIn(http.server.BaseHTTPRequestHandler):
+    """Answers GET /<status> with status, GET /stall never answers."""
+
+    def do_GET(self):
+        self.server.hits += 1
+        if self.path == "/stall":
+            self.server.release.wait(5)
+            return
+        status = int(self.path.strip("/"))
+        body = b"ok" if status == 200 else b"" if status == 304 else b"failed"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class NotTLS(socketserver.BaseRequestHandler):
+    """Counts connections and answers the TLS handshake with plain text."""
+
+    def handle(self):
+        self.server.hits += 1
+        self.request.sendall(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+
+
+class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handler):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.hits = 0
+        self.release = threading.Event()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url(self, path, scheme="http"):
+        return "{}://127.0.0.1:{}{}".format(scheme, self.server_address[1], path)
+
+    def close(self):
+        self.release.set()
+        self.shutdown()
+        self.server_close()
+
+
+class RequestTest(unittest.TestCase):
+    def setUp(self):
+        self.server = Server(StandIn)
+        self.addCleanup(self.server.close)
+
+    def get(self, request, url, wait=10):
+        """Runs the main loop until the callback is called or wait seconds
+        passed, returns the responses."""
+        loop = GLib.MainLoop()
+        responses = []
+
+        def callback(response):
+            responses.append(response)
+            loop.quit()
+
+        request.get(url, callback)
+        GLib.timeout_add(int(wait * 1000), loop.quit)
+        loop.run()
+        return responses
+
+    def test_success(self):
+        request = Request(timeout=5)
+        responses = self.get(request, self.server.url("/200"))
+        self.assertEqual(len(responses), 1)
+        self.assertTrue(responses[0].ok)
+        self.assertEqual(responses[0].contents, b"ok")
+        self.assertEqual(request.metrics.requests, 1)
+
+    def test_not_modified_is_not_a_failure(self):
+        request = Request(timeout=5, retries=2, backoff=0.1)
+        responses = self.get(request, self.server.url("/304"))
+        self.assertEqual(len(responses), 1)
+        self.assertTrue(responses[0].ok)
+        self.assertIsNone(responses[0].error_message)
+        self.assertEqual(request.metrics.failures, 0)
+        self.assertEqual(self.server.hits, 1)
+
+    def test_deadline(self):
+        request = Request(timeout=1, retries=0)
+        start = time.monotonic()
+        responses = self.get(request, self.server.url("/stall"))
+        self.assertEqual(len(responses), 1)
+        self.assertFalse(responses[0].ok)
+        self.assertEqual(responses[0].error_message, "Timed out after 1 seconds")
+        self.assertLess(time.monotonic() - start, 3)
+
+    def test_deadline_is_retried(self):
+        request = Request(timeout=1, retries=1, backoff=0.05)
+        responses = self.get(request, self.server.url("/stall"))
+        self.assertEqual(len(responses), 1)
+        self.assertEqual(responses[0].error_message, "Timed out after 1 seconds")
+        self.assertEqual(request.metrics.retries, 1)
+
+    def assert_retried(self, status):
+        request = Request(timeout=5, retries=2, backoff=0.1)
+        start = time.monotonic()
+        responses = self.get(request, self.server.url("/{}".format(status)))
+        self.assertEqual(len(responses), 1)
+        self.assertEqual(responses[0].status_code, status)
+        self.assertFalse(responses[0].ok)
+        self.assertEqual(self.server.hits, 3)
+        self.assertEqual(request.metrics.retries, 2)
+        self.assertEqual(request.metrics.failures, 3)
+        # 0.1 s then 0.2 s of backoff
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+
+    def test_5xx_is_retried(self):
+        self.assert_retried(503)
+
+    def test_429_is_retried(self):
+        self.assert_retried(429)
+
+    def test_4xx_is_not_retried(self):
+        request = Request(timeout=5, retries=2, backoff=0.1)
+        responses = self.get(request, self.server.url("/404"))
+        self.assertEqual(responses[0].status_code, 404)
+        self.assertEqual(self.server.hits, 1)
+        self.assertEqual(request.metrics.retries, 0)
+
+    def test_backoff_is_capped(self):
+        request = Request(timeout=5, retries=3, backoff=0.1, max_backoff=0.15)
+        start = time.monotonic()
+        self.get(request, self.server.url("/503"))
+        # 0.1 + 0.15 + 0.15 instead of 0.1 + 0.2 + 0.4
+        self.assertLess(time.monotonic() - start, 0.65)
+        self.assertEqual(self.server.hits, 4)
+
+    def test_tls_error_is_not_retried(self):
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), NotTLS)
+        server.daemon_threads = True
+        server.hits = 0
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        request = Request(timeout=5, retries=2, backoff=0.05)
+        responses = self.get(request, "https://127.0.0.1:{}/".format(server.server_address[1]))
+        self.assertEqual(len(responses), 1)
+        # Soup reports the handshake as a GTlsError or as SOUP_STATUS_SSL_FAILED,
+        # Response.tls_error covers both
+        self.assertTrue(responses[0].tls_error, "{} {}".format(responses[0].status_code,
+                                                               responses[0].error_message))
+        self.assertEqual(request.metrics.requests, 1)
+        self.assertEqual(request.metrics.retries, 0)
+        # Without glib-networking the handshake fails before anything is sent
+        self.assertLessEqual(server.hits, 1)
+
+    def test_cancel_suppresses_callback(self):
+        request = Request(timeout=1, retries=0)
+        GLib.timeout_add(100, lambda: request.cancel() and False)
+        responses = self.get(request, self.server.url("/stall"), wait=1.5)
+        self.assertEqual(responses, [])
+        self.assertFalse(request.active)
+
+    def test_cancel_during_backoff(self):
+        request = Request(timeout=5, retries=2, backoff=0.5)
+        GLib.timeout_add(200, lambda: request.cancel() and False)
+        responses = self.get(request, self.server.url("/503"), wait=1.5)
+        self.assertEqual(responses, [])
+        self.assertEqual(self.server.hits, 1)
+
+    def test_get_after_cancel(self):
+        request = Request(timeout=5)
+        request.cancel()
+        responses = self.get(request, self.server.url("/200"), wait=0.5)
+        self.assertEqual(responses, [])
+        self.assertEqual(self.server.hits, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()